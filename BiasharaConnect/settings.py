@@ -58,6 +58,17 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "BiasharaConnectApp.middleware.PathRoutedMiddleware",
+]
+
+# The rest of the stack depends on the path (BiasharaConnectApp/middleware.py).
+# The API authenticates with bearer tokens, so it skips the session, CSRF and
+# messages middleware and the session-table write they cost on every request.
+API_PATH_PREFIX = "/api/"
+API_MIDDLEWARE = [
+    "django.middleware.common.CommonMiddleware",
+]
+SITE_MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -66,6 +77,19 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# These checks look for the middleware in MIDDLEWARE; it runs from SITE_MIDDLEWARE instead.
+# BiasharaConnectApp/checks.py checks SITE_MIDDLEWARE in place of the security ones.
+SILENCED_SYSTEM_CHECKS = [
+    "admin.E408",  # AuthenticationMiddleware
+    "admin.E409",  # MessageMiddleware
+    "admin.E410",  # SessionMiddleware
+    "security.W002",  # XFrameOptionsMiddleware (--deploy)
+    "security.W003",  # CsrfViewMiddleware (--deploy)
+    # USERNAME_FIELD must be unique: User.email is, in any case, through the
+    # unique_user_email_ci constraint on LOWER(email), which the check can't see.
+    "auth.E003",
+]
+
 # =====================================================
 # URLS / WSGI
 # =====================================================
@@ -106,6 +130,37 @@ DATABASES = {
     )
 }
 
+# =====================================================
+# CACHE
+# =====================================================
+# Per-process locmem by default; set REDIS_URL to share the cache across
+# workers and nodes in production.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "biashara-connect",
+        }
+    }
+
+LISTINGS_CACHE_TIMEOUT = int(os.getenv("LISTINGS_CACHE_TIMEOUT", 60 * 5))
+LISTING_DETAIL_CACHE_TIMEOUT = int(os.getenv("LISTING_DETAIL_CACHE_TIMEOUT", 60 * 60))
+SELLER_HEADER_CACHE_TIMEOUT = int(os.getenv("SELLER_HEADER_CACHE_TIMEOUT", 60 * 60))
+LISTING_FACETS_CACHE_TIMEOUT = int(os.getenv("LISTING_FACETS_CACHE_TIMEOUT", 60))
+
+# Serve unfiltered facet counts from the ListingFacetCount table (kept up to
+# date by signals) instead of GROUP BY queries. Run `manage.py
+# rebuild_listing_facets` once after turning this on.
+LISTING_FACETS_PRECOMPUTED = os.getenv("LISTING_FACETS_PRECOMPUTED", "False").lower() == "true"
+
 # =====================================================
 # INTERNATIONALIZATION
 # =====================================================
@@ -149,8 +204,29 @@ if CLOUDINARY_CLOUD_NAME and CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET:
         secure=True
     )
     DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+    IMAGE_STORAGE_BACKEND = "BiasharaConnectApp.storage.CloudinaryImageStorage"
 else:
     DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+    IMAGE_STORAGE_BACKEND = "BiasharaConnectApp.storage.LocalImageStorage"
+
+# Image uploads are queued (BiasharaConnectApp/uploads.py) and run by
+# `manage.py process_image_uploads`. With IMAGE_UPLOADS_ASYNC=False each upload
+# runs in its own request instead, right after the request's transaction commits.
+IMAGE_UPLOADS_ASYNC = os.getenv("IMAGE_UPLOADS_ASYNC", "True").lower() == "true"
+IMAGE_UPLOAD_MAX_ATTEMPTS = int(os.getenv("IMAGE_UPLOAD_MAX_ATTEMPTS", 5))
+IMAGE_UPLOAD_RETRY_DELAY = int(os.getenv("IMAGE_UPLOAD_RETRY_DELAY", 30))  # seconds, doubled per attempt
+IMAGE_UPLOAD_LOCK_TIMEOUT = int(os.getenv("IMAGE_UPLOAD_LOCK_TIMEOUT", 60 * 10))
+IMAGE_UPLOAD_CONCURRENCY = int(os.getenv("IMAGE_UPLOAD_CONCURRENCY", 4))  # upload threads per batch
+IMAGE_UPLOAD_FAILED_RETENTION = int(os.getenv("IMAGE_UPLOAD_FAILED_RETENTION", 7))  # days a failed job is kept
+# Directory queued images wait in; web and worker processes must share it.
+# Empty means MEDIA_ROOT/upload-staging.
+IMAGE_UPLOAD_STAGING_ROOT = os.getenv("IMAGE_UPLOAD_STAGING_ROOT", "")
+
+# Renditions stored for every listing image (longest side in pixels); profile
+# images get a single "card"-sized one. See BiasharaConnectApp/renditions.py.
+IMAGE_RENDITIONS = {"thumb": 240, "card": 640, "full": 1600}
+IMAGE_RENDITION_FORMAT = os.getenv("IMAGE_RENDITION_FORMAT", "WEBP")  # or JPEG
+IMAGE_RENDITION_QUALITY = int(os.getenv("IMAGE_RENDITION_QUALITY", 80))
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -203,22 +279,63 @@ CSRF_TRUSTED_ORIGINS = [
 # =====================================================
 # REST FRAMEWORK
 # =====================================================
+# JSON_RENDERER selects the JSON renderer: the orjson-backed one by default,
+# "rest_framework.renderers.JSONRenderer" for DRF's stdlib encoder.
+JSON_RENDERER = os.getenv("JSON_RENDERER", "BiasharaConnectApp.renderers.ORJSONRenderer")
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
-    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_RENDERER_CLASSES": [JSON_RENDERER],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
     ],
-    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "BiasharaConnectApp.authentication.CachedJWTAuthentication",
+    ],
+    # Reverse proxies in front of the app. Client IPs (throttling) are read from
+    # the X-Forwarded-For entry the outermost trusted proxy appended; with 0,
+    # REMOTE_ADDR is used and the client-supplied header ignored. Render sets
+    # RENDER and runs one proxy.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 1 if os.getenv("RENDER") else 0)),
+}
+
+# Token-bucket budgets for expensive endpoints (BiasharaConnectApp/throttling.py),
+# per user or, for anonymous callers, per IP: `burst` requests at once, refilled at `rate`.
+THROTTLE_BUDGETS = {
+    "login": {"rate": "10/minute", "burst": 10},
+    "register": {"rate": "5/hour", "burst": 5},
+    "create_listing": {"rate": "60/hour", "burst": 20},
 }
+THROTTLE_CACHE = "default"
+
+# Users resolved from JWTs are cached per process (BiasharaConnectApp/authentication.py):
+# how long an entry lives and how many users each process keeps. Saves reach
+# every process at once through a per-user version in the shared cache; the
+# timeout bounds how long a change made without a signal (queryset .update())
+# goes unnoticed.
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", 30))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", 10000))
 
 if DEBUG:
     REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
         "rest_framework.renderers.BrowsableAPIRenderer"
     )
 
+# Soft-deleted listings untouched for this many days are moved to the archive
+# tables by `manage.py archive_deleted_listings`.
+LISTING_ARCHIVE_AFTER_DAYS = int(os.getenv("LISTING_ARCHIVE_AFTER_DAYS", 90))
+
+# Bulk listing import (BiasharaConnectApp/imports.py): rows per transaction,
+# and the most rows a single upload to the import endpoint may contain.
+LISTING_IMPORT_CHUNK_SIZE = int(os.getenv("LISTING_IMPORT_CHUNK_SIZE", 500))
+LISTING_IMPORT_MAX_ROWS = int(os.getenv("LISTING_IMPORT_MAX_ROWS", 10000))
+
+# Build listing collections straight from values() rows (BiasharaConnectApp/rows.py)
+# instead of running ListingSerializer per object. Output is identical.
+LISTINGS_FAST_SERIALIZATION = os.getenv("LISTINGS_FAST_SERIALIZATION", "True").lower() == "true"
+
 # =====================================================
 # SESSION / SECURITY
 # =====================================================
@@ -234,8 +351,20 @@ CSRF_COOKIE_SAMESITE = "Lax"
 # =====================================================
 # UPLOAD LIMITS
 # =====================================================
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+# Multipart files are vetted as they stream in (BiasharaConnectApp/upload_handlers.py)
+# and, for any request body above FILE_UPLOAD_MAX_MEMORY_SIZE, spooled to temp
+# files rather than held in worker memory.
+FILE_UPLOAD_HANDLERS = [
+    "BiasharaConnectApp.upload_handlers.ImageUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("DATA_UPLOAD_MAX_MEMORY_SIZE", 2_621_440))  # non-file fields
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", 256 * 1024))
+UPLOAD_MAX_REQUEST_SIZE = int(os.getenv("UPLOAD_MAX_REQUEST_SIZE", 50 * 1024 * 1024))
+IMAGE_UPLOAD_MAX_SIZE = int(os.getenv("IMAGE_UPLOAD_MAX_SIZE", 10 * 1024 * 1024))  # per image
+IMAGE_UPLOAD_MAX_FILES = int(os.getenv("IMAGE_UPLOAD_MAX_FILES", 10))  # images per request
+IMAGE_UPLOAD_MAX_PIXELS = int(os.getenv("IMAGE_UPLOAD_MAX_PIXELS", 40_000_000))
 
 # =====================================================
 # EMAIL
@@ -252,6 +381,20 @@ EMAIL_BACKEND = (
 AUTH_USER_MODEL = "BiasharaConnectApp.User"
 AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
 
+# PBKDF2 rounds per password hash: the CPU cost of every login attempt.
+# Changing it re-hashes each user's password at their next login; measure the
+# trade-off with `manage.py benchmark_login`.
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 1_000_000))
+# Django's defaults, with its own PBKDF2 hasher replaced: two hashers with the
+# same algorithm name can't both be listed.
+PASSWORD_HASHERS = [
+    "BiasharaConnectApp.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 # =====================================================
 # RENDER HEALTH CHECK
 # =====================================================
@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import User, BuyerProfile, SellerProfile, Listing, ListingImage, SavedListing
+from .models import User, BuyerProfile, SellerProfile, Listing, ListingImage, SavedListing, ImageUploadJob
+from .bulk import bulk_set_status
 
 
 # =========================
@@ -93,8 +97,20 @@ class SellerProfileAdmin(admin.ModelAdmin):
 # =========================
 # Inline Listing Images
 # =========================
+class ListingImageInlineFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        primaries = [
+            form for form in self.forms
+            if form.cleaned_data.get("is_primary") and not form.cleaned_data.get("DELETE")
+        ]
+        if len(primaries) > 1:
+            raise ValidationError("Only one image can be marked as primary.")
+
+
 class ListingImageInline(admin.TabularInline):
     model = ListingImage
+    formset = ListingImageInlineFormSet
     extra = 1
     fields = ("image_preview", "image", "is_primary")
     readonly_fields = ("image_preview",)
@@ -114,7 +130,7 @@ class ListingImageInline(admin.TabularInline):
 # =========================
 @admin.register(Listing)
 class ListingAdmin(admin.ModelAdmin):
-    list_display = ("title", "seller", "category", "condition", "price", "status", "created_at")
+    list_display = ("title", "seller", "category", "condition", "price", "status", "save_count", "created_at")
     list_filter = ("status", "category", "condition", "created_at", "seller")
     search_fields = ("title", "description", "location", "area")
     inlines = [ListingImageInline]
@@ -122,17 +138,17 @@ class ListingAdmin(admin.ModelAdmin):
 
     # Admin actions
     def activate_listings(self, request, queryset):
-        updated = queryset.update(status="active")
+        updated = bulk_set_status(queryset, "active")
         self.message_user(request, f"{updated} listing(s) activated.")
     activate_listings.short_description = "Activate selected listings"
 
     def deactivate_listings(self, request, queryset):
-        updated = queryset.update(status="inactive")
+        updated = bulk_set_status(queryset, "inactive")
         self.message_user(request, f"{updated} listing(s) deactivated.")
     deactivate_listings.short_description = "Deactivate selected listings"
 
     def soft_delete_listings(self, request, queryset):
-        updated = queryset.update(status="deleted")
+        updated = bulk_set_status(queryset, "deleted")
         self.message_user(request, f"{updated} listing(s) soft-deleted.")
     soft_delete_listings.short_description = "Soft delete selected listings"
 
@@ -144,3 +160,23 @@ class ListingAdmin(admin.ModelAdmin):
 class SavedListingAdmin(admin.ModelAdmin):
     list_display = ("buyer", "listing", "saved_at")
     search_fields = ("buyer__user__email", "listing__title")
+
+
+# =========================
+# Image Upload Job Admin
+# =========================
+@admin.register(ImageUploadJob)
+class ImageUploadJobAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "listing_image", "seller", "status", "attempts", "available_at", "updated_at")
+    list_filter = ("status",)
+    readonly_fields = (
+        "listing_image", "seller", "folder", "file_name", "staged_name", "attempts", "last_error", "locked_at",
+    )
+    actions = ["retry_jobs"]
+
+    def retry_jobs(self, request, queryset):
+        updated = queryset.filter(status="failed").exclude(staged_name="").update(
+            status="pending", attempts=0, available_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} upload(s) queued again.")
+    retry_jobs.short_description = "Retry selected failed uploads"
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BiasharaConnectAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'BiasharaConnectApp'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .search import ensure_sqlite_triggers
+        post_migrate.connect(ensure_sqlite_triggers, sender=self)
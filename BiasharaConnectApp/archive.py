@@ -0,0 +1,88 @@
+"""
+Archiving of soft-deleted listings.
+
+Listings soft-deleted longer ago than the cut-off are copied, with their
+images and saves, into the Archived* tables and then removed from the live
+tables, one batch per transaction. Archived rows keep their original ids.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import (
+    Listing,
+    ListingImage,
+    SavedListing,
+    ImageUploadJob,
+    ArchivedListing,
+    ArchivedListingImage,
+    ArchivedSavedListing,
+)
+from .uploads import delete_staged
+
+
+def _columns(archive_model):
+    return [field.attname for field in archive_model._meta.concrete_fields if field.name != "archived_at"]
+
+
+def _delete_where_in(model, column, ids):
+    """DELETE rows of `model` whose `column` is one of `ids`."""
+    qn = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {qn(model._meta.db_table)} WHERE {qn(column)} IN ({placeholders})", ids
+        )
+
+
+def due_for_archive(cutoff):
+    """Soft-deleted listings last touched before `cutoff`, oldest first."""
+    return Listing.objects.filter(status="deleted", updated_at__lt=cutoff).order_by("updated_at", "id")
+
+
+def archive_deleted_listings(cutoff, batch_size=500):
+    """Archive every listing `due_for_archive(cutoff)`. Returns the number archived."""
+    archived = 0
+    while True:
+        ids = list(due_for_archive(cutoff).values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        archived += archive_batch(ids, cutoff)
+    return archived
+
+
+@transaction.atomic
+def archive_batch(ids, cutoff):
+    # Lock and re-check the rows, so a listing restored since it was picked stays put.
+    ids = list(
+        due_for_archive(cutoff).filter(id__in=ids).select_for_update().values_list("id", flat=True)
+    )
+    if not ids:
+        return 0
+
+    now = timezone.now()
+    ArchivedListing.objects.bulk_create(
+        ArchivedListing(archived_at=now, **row)
+        for row in Listing.objects.filter(id__in=ids).values(*_columns(ArchivedListing))
+    )
+    ArchivedListingImage.objects.bulk_create(
+        ArchivedListingImage(**row)
+        for row in ListingImage.objects.filter(listing_id__in=ids).values(*_columns(ArchivedListingImage))
+    )
+    ArchivedSavedListing.objects.bulk_create(
+        ArchivedSavedListing(**row)
+        for row in SavedListing.objects.filter(listing_id__in=ids).values(*_columns(ArchivedSavedListing))
+    )
+
+    # Plain DELETEs: these listings are in no cache, feed or facet count, so
+    # the per-row delete signals a cascading Model.delete() would fire are
+    # pure overhead. Children go first to satisfy the foreign keys.
+    image_ids = list(ListingImage.objects.filter(listing_id__in=ids).values_list("id", flat=True))
+    if image_ids:
+        jobs = ImageUploadJob.objects.filter(listing_image_id__in=image_ids)
+        staged_names = list(jobs.exclude(staged_name="").values_list("staged_name", flat=True))
+        _delete_where_in(ImageUploadJob, ImageUploadJob._meta.get_field("listing_image").column, image_ids)
+        transaction.on_commit(lambda: delete_staged(staged_names))
+        _delete_where_in(ListingImage, "id", image_ids)
+    _delete_where_in(SavedListing, SavedListing._meta.get_field("listing").column, ids)
+    _delete_where_in(Listing, "id", ids)
+    return len(ids)
@@ -0,0 +1,128 @@
+"""
+JWT authentication for the API.
+
+Tokens from login_user carry the user's `role` and the ids of their seller
+and buyer profiles as claims. CachedJWTAuthentication resolves the token's
+user through a small per-process cache (AUTH_USER_CACHE_TIMEOUT seconds), so
+most requests authenticate without a user query, and fills the profile ids
+in from the claims so views don't query for those either.
+
+Each entry remembers the user's "auth version", a key in the shared Django
+cache, and a hit only counts while that key still holds the same value.
+Saving or deleting a user bumps it (signals.py), so every process reloads
+the user on its next request, not just the one that saved. Queryset
+`.update()` and raw SQL send no signal: call invalidate_cached_user() after
+them, or other processes keep the old row for up to the timeout. A token
+whose `role` claim no longer matches the user is refused, so a role change
+needs a fresh login.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+_users = OrderedDict()  # user id -> (expires at, auth version, field values)
+_lock = threading.Lock()
+
+
+def tokens_for_user(user):
+    """A refresh token (and, via `.access_token`, an access token) with the user's role and profile ids."""
+    refresh = RefreshToken.for_user(user)
+    refresh["role"] = user.role
+    refresh["seller_id"] = user.seller_profile_id
+    refresh["buyer_id"] = user.buyer_profile_id
+    return refresh
+
+
+def user_version_key(user_id):
+    return f"auth:user-version:{user_id}"
+
+
+def user_version_timeout():
+    # A lost version key is reseeded and forces a reload, so it may expire;
+    # it only has to outlive the per-process entries that recorded it.
+    return settings.AUTH_USER_CACHE_TIMEOUT * 10
+
+
+def get_user_version(user_id):
+    key = user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted key never comes back with a value
+        # some process cached the user under.
+        cache.add(key, time.time_ns(), timeout=user_version_timeout())
+        version = cache.get(key)
+    return version
+
+
+def get_cached_user(user_id):
+    """
+    A fresh User instance for `user_id` from this process's cache, loading it
+    on a miss or when the user's auth version has moved; None if there is no
+    such user.
+    """
+    field_names = [field.attname for field in User._meta.concrete_fields]
+    # Read before loading the row, so a change made in between leaves the
+    # entry under an old version and it is reloaded next time.
+    version = get_user_version(user_id)
+    now = time.monotonic()
+    with _lock:
+        entry = _users.get(user_id)
+        if entry is not None and entry[0] > now and entry[1] == version:
+            _users.move_to_end(user_id)
+            values = entry[2]
+        else:
+            values = None
+
+    if values is None:
+        values = User.objects.filter(pk=user_id).values_list(*field_names).first()
+        if values is None:
+            return None
+        with _lock:
+            _users[user_id] = (now + settings.AUTH_USER_CACHE_TIMEOUT, version, values)
+            _users.move_to_end(user_id)
+            while len(_users) > settings.AUTH_USER_CACHE_SIZE:
+                _users.popitem(last=False)
+
+    # A new instance per request: nothing cached on it leaks into the next one.
+    return User.from_db(User.objects.db, field_names, values)
+
+
+def invalidate_cached_user(user_id):
+    """Make every process reload `user_id` on its next request."""
+    cache.set(user_version_key(user_id), time.time_ns(), timeout=user_version_timeout())
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def clear_user_cache():
+    with _lock:
+        _users.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if validated_token.get("role") != user.role:
+            raise AuthenticationFailed("Token is out of date, log in again", code="token_stale")
+
+        user.seller_profile_id = validated_token.get("seller_id")
+        user.buyer_profile_id = validated_token.get("buyer_id")
+        return user
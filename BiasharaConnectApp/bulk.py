@@ -0,0 +1,38 @@
+"""
+Bulk listing writes.
+
+QuerySet.update() skips the Listing signals, so every helper here invalidates
+caches and refreshes facet counts itself: caches once per chunk, counts once
+per call.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_listings
+from .facets import refresh_facet_counts
+
+BULK_STATUS_CHUNK_SIZE = 500
+
+
+def bulk_set_status(queryset, status, chunk_size=BULK_STATUS_CHUNK_SIZE):
+    """
+    Move every listing in `queryset` to `status` with one UPDATE per chunk of
+    ids, in id order. Rows already in `status` are left alone, so their
+    `updated_at` does not move. Returns the number of rows changed.
+    """
+    queryset = queryset.exclude(status=status).order_by()
+    last_id, updated = 0, 0
+
+    while True:
+        ids = list(queryset.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            changed = queryset.filter(id__in=ids).update(status=status, updated_at=timezone.now())
+            transaction.on_commit(lambda ids=ids: invalidate_listings(ids))
+        updated += changed
+        last_id = ids[-1]
+
+    if updated:
+        refresh_facet_counts()
+    return updated
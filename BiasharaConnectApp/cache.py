@@ -0,0 +1,99 @@
+"""
+Caching for listing reads.
+
+Every cached listings page is keyed by its query string plus a global
+"listings version". Writes never delete page keys; they bump the version,
+which orphans every cached page at once and lets the backend evict them.
+
+Single listings and seller storefront headers are cached per object and
+deleted explicitly when the listing, its images or its seller change.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import urlencode
+
+LISTINGS_VERSION_KEY = "listings:version"
+LISTINGS_CHANGED_AT_KEY = "listings:changed_at"
+
+
+def get_listings_version():
+    version = cache.get(LISTINGS_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1 so a flushed or evicted counter
+        # can never come back as a version that old pages were cached under.
+        # A lost counter may have missed a change, so count it as one.
+        cache.add(LISTINGS_VERSION_KEY, time.time_ns(), timeout=None)
+        cache.set(LISTINGS_CHANGED_AT_KEY, int(time.time()), timeout=None)
+        version = cache.get(LISTINGS_VERSION_KEY)
+    return version
+
+
+def get_listings_changed_at():
+    """Unix time of the last version bump: the latest change to any listing representation."""
+    get_listings_version()
+    return cache.get(LISTINGS_CHANGED_AT_KEY)
+
+
+def bump_listings_version():
+    try:
+        cache.incr(LISTINGS_VERSION_KEY)
+    except ValueError:
+        cache.set(LISTINGS_VERSION_KEY, time.time_ns(), timeout=None)
+    cache.set(LISTINGS_CHANGED_AT_KEY, int(time.time()), timeout=None)
+
+
+def listings_page_key(query_params, prefix="feed"):
+    """Cache key for a listings response, independent of query parameter order."""
+    items = sorted((key, value) for key in query_params for value in query_params.getlist(key))
+    digest = hashlib.md5(urlencode(items).encode(), usedforsecurity=False).hexdigest()
+    return f"listings:{prefix}:{get_listings_version()}:{digest}"
+
+
+def get_cached_page(key):
+    return cache.get(key)
+
+
+def set_cached_page(key, data, timeout=None):
+    cache.set(key, data, timeout=settings.LISTINGS_CACHE_TIMEOUT if timeout is None else timeout)
+
+
+def listing_detail_key(listing_id):
+    return f"listings:detail:{listing_id}"
+
+
+def get_cached_listing(listing_id):
+    return cache.get(listing_detail_key(listing_id))
+
+
+def set_cached_listing(listing_id, data):
+    cache.set(listing_detail_key(listing_id), data, timeout=settings.LISTING_DETAIL_CACHE_TIMEOUT)
+
+
+def seller_header_key(seller_id):
+    return f"sellers:header:{seller_id}"
+
+
+def get_cached_seller_header(seller_id):
+    return cache.get(seller_header_key(seller_id))
+
+
+def set_cached_seller_header(seller_id, data):
+    cache.set(seller_header_key(seller_id), data, timeout=settings.SELLER_HEADER_CACHE_TIMEOUT)
+
+
+def invalidate_seller_header(seller_id):
+    cache.delete(seller_header_key(seller_id))
+
+
+def invalidate_listing_details(listing_ids):
+    cache.delete_many([listing_detail_key(listing_id) for listing_id in listing_ids])
+
+
+def invalidate_listings(listing_ids=()):
+    """Drop every cached feed page and the given listings' detail entries."""
+    bump_listings_version()
+    if listing_ids:
+        invalidate_listing_details(listing_ids)
@@ -0,0 +1,33 @@
+"""
+System checks for the per-path middleware stacks (middleware.py).
+
+Django's security.W002 / W003 look for the clickjacking and CSRF middleware in
+MIDDLEWARE, where they never are here, so they are silenced and these look
+for them in SITE_MIDDLEWARE instead. API_MIDDLEWARE needs neither: API views
+are token-authenticated and return JSON.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+SITE_MIDDLEWARE_REQUIRED = (
+    (
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+        "BiasharaConnectApp.W001",
+        "Your pages will not be served with an 'x-frame-options' header, so the admin can be framed "
+        "by other sites (clickjacking).",
+    ),
+    (
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "BiasharaConnectApp.W002",
+        "The admin's forms will not be protected against cross-site request forgery.",
+    ),
+)
+
+
+@register(Tags.security, deploy=True)
+def check_site_middleware(app_configs, **kwargs):
+    return [
+        Warning(f"{path} is not in SITE_MIDDLEWARE. {message}", id=check_id)
+        for path, check_id, message in SITE_MIDDLEWARE_REQUIRED
+        if path not in settings.SITE_MIDDLEWARE
+    ]
@@ -0,0 +1,64 @@
+"""
+Conditional GET support (ETag / Last-Modified) for listing endpoints.
+
+Validators are derived from the result set with one aggregate query, so a
+matching If-None-Match / If-Modified-Since can be answered with a 304
+before any listing is fetched or serialized.
+"""
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+
+from .cache import get_listings_version, get_listings_changed_at
+
+
+def listing_validators(queryset, query_params=None):
+    """
+    Return `(etag, last_modified)` for a listing queryset, where
+    `last_modified` is a Unix timestamp or None for an empty result.
+
+    The ETag folds in the row count, so rows leaving the set change it even
+    when `max(updated_at)` does not move, and the listings version (cache.py),
+    which moves when anything embedded in a listing's representation changes
+    without touching its row: the seller's name, verification or image.
+    Last-Modified likewise covers the time of the last version bump.
+    """
+    stats = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("id"))
+    last_modified = stats["last_modified"]
+
+    params = ""
+    if query_params is not None:
+        params = urlencode(sorted((key, value) for key in query_params for value in query_params.getlist(key)))
+
+    stamp = last_modified.isoformat() if last_modified else ""
+    version = get_listings_version()
+    digest = hashlib.md5(
+        f"{params}|{stats['count']}|{stamp}|{version}".encode(), usedforsecurity=False
+    ).hexdigest()
+    if last_modified is None:
+        return quote_etag(digest), None
+    return quote_etag(digest), max(int(last_modified.timestamp()), get_listings_changed_at() or 0)
+
+
+def representation_etag(data):
+    """ETag for an already-serialized object: a hash of its content."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return quote_etag(hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest())
+
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 response if the request's preconditions match, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,120 @@
+"""
+Facet counts for the listings filter sidebar.
+
+Counts follow the current filter set, except that each facet ignores its own
+filter, so picking "Electronics" still shows how many listings the other
+categories have. Every facet is one GROUP BY over the active listings, served
+from `listing_active_facets_idx`.
+
+With LISTING_FACETS_PRECOMPUTED on, the unfiltered counts (the sidebar most
+visitors see) come from ListingFacetCount instead. That table is adjusted
+incrementally from the Listing signals; writes that bypass signals, such as
+QuerySet.update(), must call `refresh_facet_counts()`.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from .filters import filter_listings
+from .models import Listing, ListingFacetCount
+
+# Facets kept in ListingFacetCount. Area is scoped to a location, so it is
+# only offered once a location is chosen and is always counted live.
+PRECOMPUTED_FACETS = ("category", "condition", "location")
+
+FILTER_KEYS = ("q", "category", "condition", "location", "area", "min_price", "max_price")
+
+# Free-text facets are capped to their most common values.
+FACET_VALUE_LIMIT = 50
+
+
+def facet_counts(filters):
+    """
+    Counts per facet value for validated `ListingFilterSerializer` data.
+    Choice facets list every choice, zero counts included.
+    """
+    filters = {key: filters[key] for key in FILTER_KEYS if filters.get(key) not in (None, "")}
+
+    if settings.LISTING_FACETS_PRECOMPUTED and not filters:
+        counts = precomputed_counts()
+    else:
+        counts = {facet: live_counts(facet, filters) for facet in PRECOMPUTED_FACETS}
+
+    data = {
+        "category": _choice_facet(Listing.CATEGORY_CHOICES, counts["category"]),
+        "condition": _choice_facet(Listing.CONDITION_CHOICES, counts["condition"]),
+        "location": _value_facet(counts["location"]),
+    }
+    if filters.get("location"):
+        data["area"] = _value_facet(live_counts("area", filters))
+    return data
+
+
+def live_counts(facet, filters):
+    """`{value: count}` for one facet, under every filter except the facet's own."""
+    ignored = {facet, "area"} if facet == "location" else {facet}
+    queryset, _ = filter_listings(
+        Listing.objects.active(), {key: value for key, value in filters.items() if key not in ignored}
+    )
+    rows = queryset.order_by().values_list(facet).annotate(count=Count("*"))
+    return dict(rows)
+
+
+def precomputed_counts():
+    counts = {facet: {} for facet in PRECOMPUTED_FACETS}
+    for facet, value, count in ListingFacetCount.objects.filter(count__gt=0).values_list("facet", "value", "count"):
+        counts[facet][value] = count
+    return counts
+
+
+def _choice_facet(choices, counts):
+    return [{"value": value, "label": label, "count": counts.get(value, 0)} for value, label in choices]
+
+
+def _value_facet(counts):
+    ranked = sorted(((value, count) for value, count in counts.items() if count), key=lambda item: (-item[1], item[0]))
+    return [{"value": value, "count": count} for value, count in ranked[:FACET_VALUE_LIMIT]]
+
+
+# =========================
+# Precomputed table
+# =========================
+def listing_facet_values(listing):
+    """The `(facet, value)` pairs an active listing contributes to; none otherwise."""
+    if listing.status != "active":
+        return ()
+    return tuple((facet, getattr(listing, facet)) for facet in PRECOMPUTED_FACETS)
+
+
+def adjust_facet_counts(before, after):
+    """Apply the difference between two sets of `(facet, value)` pairs."""
+    delta = Counter(after)
+    delta.subtract(before)
+    for (facet, value), change in sorted(delta.items()):
+        if not change:
+            continue
+        updated = ListingFacetCount.objects.filter(facet=facet, value=value).update(count=F("count") + change)
+        if not updated:
+            ListingFacetCount.objects.get_or_create(facet=facet, value=value)
+            ListingFacetCount.objects.filter(facet=facet, value=value).update(count=F("count") + change)
+
+
+@transaction.atomic
+def rebuild_facet_counts():
+    """Recompute ListingFacetCount from the active listings. Returns the number of rows written."""
+    rows = [
+        ListingFacetCount(facet=facet, value=value, count=count)
+        for facet in PRECOMPUTED_FACETS
+        for value, count in live_counts(facet, {}).items()
+    ]
+    ListingFacetCount.objects.all().delete()
+    ListingFacetCount.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_facet_counts():
+    """Rebuild the precomputed table after bulk writes, if it is in use."""
+    if settings.LISTING_FACETS_PRECOMPUTED:
+        rebuild_facet_counts()
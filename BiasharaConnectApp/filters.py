@@ -0,0 +1,102 @@
+from rest_framework import serializers
+from .models import Listing
+from .search import search_listings
+from .serializers import ListingSerializer, ListingCardSerializer
+
+
+# Keyset orderings for each supported sort; every one ends in a unique column.
+# Column sorts are backed by indexes on Listing.Meta, relevance by the search index.
+# Price is nullable, so the price sorts list unpriced listings last (see KeysetPagination).
+SORT_ORDERINGS = {
+    "newest": ("-created_at", "-id"),
+    "price_asc": ("price", "id"),
+    "price_desc": ("-price", "-id"),
+    "popular": ("-save_count", "-created_at", "-id"),
+    "relevance": ("-search_rank", "-id"),
+}
+
+LISTING_VIEWS = {
+    "full": ListingSerializer,
+    "card": ListingCardSerializer,
+}
+
+
+# =========================
+# Listing Shape Serializer
+# =========================
+class ListingShapeSerializer(serializers.Serializer):
+    """Validates the representation parameters shared by every listing collection."""
+
+    # Representation: `view=card` for the compact grid shape, `fields=a,b,c` for a sparse fieldset.
+    view = serializers.ChoiceField(choices=list(LISTING_VIEWS), default="full")
+    fields = serializers.CharField(required=False)
+
+    def validate(self, data):
+        available = LISTING_VIEWS[data["view"]].Meta.fields
+        if data.get("fields"):
+            requested = [name.strip() for name in data["fields"].split(",") if name.strip()]
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise serializers.ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+            data["fields"] = requested
+        else:
+            data["fields"] = list(available)
+        return data
+
+
+# =========================
+# Listing Filter Serializer
+# =========================
+class ListingFilterSerializer(ListingShapeSerializer):
+    """Validates the listings feed query string."""
+
+    q = serializers.CharField(max_length=200, required=False)
+    category = serializers.ChoiceField(choices=Listing.CATEGORY_CHOICES, required=False)
+    condition = serializers.ChoiceField(choices=Listing.CONDITION_CHOICES, required=False)
+    location = serializers.CharField(max_length=100, required=False)
+    area = serializers.CharField(max_length=100, required=False)
+    min_price = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, required=False)
+    max_price = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, required=False)
+    sort = serializers.ChoiceField(choices=list(SORT_ORDERINGS), required=False)
+
+    def validate(self, data):
+        min_price = data.get("min_price")
+        max_price = data.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError({"max_price": "Must be greater than or equal to min_price."})
+        if data.get("area") and not data.get("location"):
+            raise serializers.ValidationError({"area": "Filtering by area requires a location."})
+        if data.get("sort") == "relevance" and not data.get("q"):
+            raise serializers.ValidationError({"sort": "Sorting by relevance requires a search query."})
+        data.setdefault("sort", "relevance" if data.get("q") else "newest")
+        return super().validate(data)
+
+
+# =========================
+# Seller Listings Filter Serializer
+# =========================
+class SellerListingsFilterSerializer(ListingShapeSerializer):
+    """Validates the "my listings" query string: an optional status plus the representation."""
+
+    status = serializers.ChoiceField(choices=Listing.STATUS_CHOICES, required=False)
+
+
+def filter_listings(queryset, filters):
+    """
+    Apply validated `ListingFilterSerializer` data to a listing queryset.
+    Returns the filtered queryset and the keyset ordering for the chosen sort.
+    """
+    if filters.get("q"):
+        queryset = search_listings(queryset, filters["q"])
+
+    for field in ("category", "condition", "location", "area"):
+        if filters.get(field):
+            queryset = queryset.filter(**{field: filters[field]})
+
+    if filters.get("min_price") is not None:
+        queryset = queryset.filter(price__gte=filters["min_price"])
+    if filters.get("max_price") is not None:
+        queryset = queryset.filter(price__lte=filters["max_price"])
+
+    sort = filters.get("sort", "newest")
+    return queryset, SORT_ORDERINGS[sort]
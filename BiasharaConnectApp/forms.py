@@ -1,6 +1,23 @@
 from django import forms
-import cloudinary.uploader
 from .models import SellerProfile, Listing, ListingImage
+from .uploads import enqueue_profile_image, queue_upload, LISTING_IMAGE_FOLDER
+
+
+def after_save(form, commit, callback):
+    """
+    Run `callback` once the form's instance is in the database: now when
+    saved with commit=True, else with the caller's save_m2m() (the admin
+    saves with commit=False, then the instance, then calls save_m2m()).
+    """
+    if commit:
+        callback()
+        return
+    save_m2m = form.save_m2m
+
+    def save_m2m_then_callback():
+        save_m2m()
+        callback()
+    form.save_m2m = save_m2m_then_callback
 
 
 # =========================
@@ -24,20 +41,10 @@ class SellerProfileForm(forms.ModelForm):
         ]
 
     def save(self, commit=True):
-        instance = super().save(commit=False)
+        instance = super().save(commit)
         image_file = self.cleaned_data.get("upload_profile_image")
-
         if image_file:
-            upload_result = cloudinary.uploader.upload(
-                image_file,
-                folder="BiasharaConnect/profile_images",
-                quality="auto",
-                fetch_format="auto",
-            )
-            instance.profile_image = upload_result.get("secure_url")
-
-        if commit:
-            instance.save()
+            after_save(self, commit, lambda: enqueue_profile_image(instance, image_file))
         return instance
 
 
@@ -72,18 +79,10 @@ class ListingImageForm(forms.ModelForm):
         fields = ["upload_image", "is_primary"]
 
     def save(self, commit=True):
-        instance = super().save(commit=False)
         image_file = self.cleaned_data.get("upload_image")
-
         if image_file:
-            upload_result = cloudinary.uploader.upload(
-                image_file,
-                folder="BiasharaConnect/listings",
-                quality="auto",
-                fetch_format="auto",
-            )
-            instance.image = upload_result.get("secure_url")
-
-        if commit:
-            instance.save()
+            self.instance.upload_status = "pending"
+        instance = super().save(commit)
+        if image_file:
+            after_save(self, commit, lambda: queue_upload(image_file, LISTING_IMAGE_FOLDER, listing_image=instance))
         return instance
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 at PASSWORD_HASH_ITERATIONS rounds.
+
+    Same algorithm name and hash format as Django's hasher, so existing hashes
+    keep verifying. A hash stored at any other round count is re-encoded at
+    the configured one when its user next logs in.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
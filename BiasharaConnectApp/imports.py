@@ -0,0 +1,127 @@
+"""
+Bulk listing import from CSV or JSON Lines.
+
+Rows are read lazily from the stream, validated one at a time with
+ListingImportSerializer and inserted with bulk_create, one transaction per
+chunk. Memory is bounded by the chunk size and the error cap, not the file
+size, and a bad row is reported without affecting any other row.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .cache import invalidate_listings
+from .facets import refresh_facet_counts
+from .models import Listing
+from .serializers import ListingImportSerializer
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+class ImportResult:
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def guess_format(filename):
+    """`csv` or `jsonl` from a file name, or None."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def read_rows(stream, fmt):
+    """
+    Yield `(row_number, data)` from a binary stream, where `data` is a dict,
+    or a string describing why the row could not be parsed.
+    """
+    try:
+        yield from _read_rows(stream, fmt)
+    except UnicodeDecodeError:
+        yield None, "File is not valid UTF-8; nothing after this point was imported."
+    except csv.Error as exc:
+        yield None, f"Malformed CSV ({exc}); nothing after this point was imported."
+
+
+def _read_rows(stream, fmt):
+    lines = codecs.iterdecode(stream, "utf-8-sig")
+    if fmt == "csv":
+        # Row numbers count the header as row 1, as spreadsheets show them.
+        for row_number, row in enumerate(csv.DictReader(lines), start=2):
+            # Empty cells are missing values, so optional columns may be left blank.
+            yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield row_number, "Invalid JSON."
+            continue
+        yield row_number, data if isinstance(data, dict) else "Each line must be a JSON object."
+
+
+def import_listings(seller, rows, chunk_size=500, max_errors=100, max_rows=None):
+    """
+    Create a listing for `seller` from every valid row of `rows` (as yielded by
+    `read_rows`). Returns an ImportResult.
+    """
+    result = ImportResult(max_errors)
+    serializer = ListingImportSerializer()
+    chunk = []
+
+    for index, (row_number, data) in enumerate(rows):
+        if max_rows is not None and index >= max_rows:
+            result.add_error(row_number, f"Row limit of {max_rows} reached; the rest of the file was not imported.")
+            break
+        if isinstance(data, str):
+            result.add_error(row_number, data)
+            continue
+        try:
+            validated = serializer.run_validation(data)
+        except serializers.ValidationError as exc:
+            result.add_error(row_number, exc.detail)
+            continue
+
+        chunk.append(Listing(seller=seller, **validated))
+        if len(chunk) >= chunk_size:
+            result.created += _insert_chunk(chunk)
+            chunk = []
+
+    if chunk:
+        result.created += _insert_chunk(chunk)
+    if result.created:
+        refresh_facet_counts()
+    return result
+
+
+def _insert_chunk(listings):
+    # bulk_create skips the Listing signals, so invalidate once for the whole chunk.
+    with transaction.atomic():
+        Listing.objects.bulk_create(listings)
+        transaction.on_commit(invalidate_listings)
+    return len(listings)
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from BiasharaConnectApp.archive import archive_deleted_listings, due_for_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move listings soft-deleted more than --days ago, with their images and "
+        "saves, into the archive tables. Runs in batches; safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.LISTING_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the listings due.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        if options["dry_run"]:
+            due = due_for_archive(cutoff).count()
+            self.stdout.write(f"{due} listing(s) would be archived.")
+            return
+
+        archived = archive_deleted_listings(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} listing(s)."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from BiasharaConnectApp.cache import invalidate_listings
+from BiasharaConnectApp.models import Listing
+
+
+class Command(BaseCommand):
+    help = (
+        "Populate Listing.primary_image from ListingImage, promoting the oldest "
+        "image of any listing that has images but no primary. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id, total = 0, 0
+
+        while True:
+            batch = list(
+                Listing.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            total += Listing.objects.sync_primary_images(batch)
+            invalidate_listings(batch)
+            last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled primary images for {total} listing(s)."))
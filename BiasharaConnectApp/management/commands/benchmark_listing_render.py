@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from BiasharaConnectApp.models import User, SellerProfile, Listing, ListingImage
+from BiasharaConnectApp.renderers import ORJSONRenderer
+from BiasharaConnectApp.rows import serialize_listing_rows
+from BiasharaConnectApp.serializers import ListingSerializer
+
+FIELDS = list(ListingSerializer.Meta.fields)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark rendering listing collections: ListingSerializer + JSONRenderer "
+        "against values() rows + ORJSONRenderer. Seeds throwaway listings inside "
+        "a transaction that is always rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per size; the best run is reported.")
+        parser.add_argument("--images", type=int, default=2, help="Images per seeded listing.")
+
+    def handle(self, *args, **options):
+        sizes = sorted(options["rows"])
+        with transaction.atomic():
+            self.seed(sizes[-1], options["images"])
+
+            self.stdout.write(f"{'rows':>7}  {'serializer':>12}  {'fast path':>12}  {'speed-up':>8}")
+            for size in sizes:
+                slow, slow_bytes = self.best_of(options["repeat"], self.serializer_path, size)
+                fast, fast_bytes = self.best_of(options["repeat"], self.fast_path, size)
+                if slow_bytes != fast_bytes:
+                    self.stderr.write(self.style.ERROR(f"Output differs at {size} rows."))
+                self.stdout.write(
+                    f"{size:>7}  {slow * 1000:>10.1f}ms  {fast * 1000:>10.1f}ms  {slow / fast:>7.1f}x"
+                )
+
+            transaction.set_rollback(True)
+
+    def seed(self, count, images_per_listing):
+        user = User(
+            email="benchmark-seller@example.invalid", first_name="Bench",
+            last_name="Mark", phone="0", role="seller",
+        )
+        user.set_unusable_password()
+        user.save()
+        seller = SellerProfile.objects.create(
+            user=user, business_name="Benchmark", business_type="company",
+            business_category="electronics", business_location="Nairobi",
+        )
+        listings = Listing.objects.bulk_create(
+            [
+                Listing(
+                    seller=seller, title=f"Benchmark item {index}", description="Lorem ipsum " * 20,
+                    price=index, category="electronics", condition="used", location="Nairobi", area="CBD",
+                )
+                for index in range(count)
+            ],
+            batch_size=1000,
+        )
+        ListingImage.objects.bulk_create(
+            [
+                ListingImage(listing=listing, image=f"BiasharaConnect/listing/bench_{listing.pk}_{index}",
+                             is_primary=(index == 0))
+                for listing in listings
+                for index in range(images_per_listing)
+            ],
+            batch_size=1000,
+        )
+        self.seller = seller
+
+    def queryset(self):
+        return Listing.objects.filter(seller=self.seller).order_by("-created_at", "-id")
+
+    def serializer_path(self, size):
+        listings = list(self.queryset().with_related()[:size])
+        return JSONRenderer().render(ListingSerializer(listings, many=True).data)
+
+    def fast_path(self, size):
+        rows = list(self.queryset().values_for_fields(FIELDS)[:size])
+        return ORJSONRenderer().render(serialize_listing_rows(rows, FIELDS))
+
+    @staticmethod
+    def best_of(repeat, func, size):
+        best, output = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = func(size)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,40 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from BiasharaConnectApp.hashers import ConfigurablePBKDF2PasswordHasher
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput per CPU core at several PBKDF2 round counts, "
+        "to choose PASSWORD_HASH_ITERATIONS. Times password verification, which "
+        "dominates a login (a login for an unknown email hashes a dummy password "
+        "at the same cost)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations", type=int, nargs="+",
+            default=[100_000, 260_000, 600_000, 1_000_000],
+        )
+        parser.add_argument("--logins", type=int, default=20, help="Verifications timed per round count.")
+
+    def handle(self, *args, **options):
+        hasher = ConfigurablePBKDF2PasswordHasher()
+        cores = os.cpu_count() or 1
+        iterations = sorted(set(options["iterations"]) | {settings.PASSWORD_HASH_ITERATIONS})
+
+        self.stdout.write(f"{'iterations':>11}  {'per login':>10}  {'logins/s/core':>13}  {f'x{cores} cores':>11}")
+        for rounds in iterations:
+            encoded = hasher.encode("benchmark-password", hasher.salt(), rounds)
+            start = time.perf_counter()
+            for _ in range(options["logins"]):
+                hasher.verify("benchmark-password", encoded)
+            per_login = (time.perf_counter() - start) / options["logins"]
+            current = "  <- PASSWORD_HASH_ITERATIONS" if rounds == settings.PASSWORD_HASH_ITERATIONS else ""
+            self.stdout.write(
+                f"{rounds:>11,}  {per_login * 1000:>8.1f}ms  {1 / per_login:>13.1f}  {cores / per_login:>11.1f}{current}"
+            )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from BiasharaConnectApp.imports import IMPORT_FORMATS, guess_format, read_rows, import_listings
+from BiasharaConnectApp.models import SellerProfile, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Import listings for one seller from a CSV or JSON Lines file. The file is "
+        "streamed, so its size does not matter; failed rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--seller", required=True, help="Seller's account email.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Rows per transaction.")
+        parser.add_argument("--max-errors", type=int, default=100, help="Failed rows to list in full.")
+
+    def handle(self, *args, **options):
+        seller = SellerProfile.objects.filter(user__in=User.objects.with_email(options["seller"])).first()
+        if not seller:
+            raise CommandError(f"No seller with email {options['seller']}.")
+
+        fmt = options["format"] or guess_format(options["path"])
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError("Cannot tell the file format; pass --format csv or --format jsonl.")
+
+        with open(options["path"], "rb") as stream:
+            result = import_listings(
+                seller, read_rows(stream, fmt),
+                chunk_size=options["chunk_size"], max_errors=options["max_errors"],
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... and {result.failed - len(result.errors)} more failed row(s).")
+        self.stdout.write(self.style.SUCCESS(f"Imported {result.created} listing(s); {result.failed} row(s) failed."))
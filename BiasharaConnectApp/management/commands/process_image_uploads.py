@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from BiasharaConnectApp.uploads import process_jobs, prune_failed_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued image uploads. Loops until stopped unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs claimed per round.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Run a single round and exit.")
+
+    def handle(self, *args, **options):
+        while True:
+            succeeded, failed = process_jobs(options["batch_size"])
+            if succeeded or failed:
+                self.stdout.write(f"Uploaded {succeeded} image(s); {failed} failed.")
+            if options["once"] or not (succeeded or failed):
+                pruned = prune_failed_jobs()
+                if pruned:
+                    self.stdout.write(f"Pruned {pruned} failed upload(s).")
+            if options["once"]:
+                break
+            if not (succeeded or failed):
+                time.sleep(options["sleep"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from BiasharaConnectApp.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the precomputed ListingFacetCount table from active listings. "
+        "Run once after enabling LISTING_FACETS_PRECOMPUTED, or to repair drift."
+    )
+
+    def handle(self, *args, **options):
+        written = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} facet count(s)."))
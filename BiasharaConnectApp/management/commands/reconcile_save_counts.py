@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from BiasharaConnectApp.cache import invalidate_listings
+from BiasharaConnectApp.models import Listing, SavedListing
+
+
+class Command(BaseCommand):
+    help = "Recompute Listing.save_count from SavedListing, rewriting only listings that drifted."
+
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                SavedListing.objects.filter(listing=OuterRef("pk"))
+                .order_by()
+                .values("listing")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        # One UPDATE ... WHERE save_count <> (grouped count) statement.
+        fixed = Listing.objects.alias(actual=actual).exclude(save_count=F("actual")).update(save_count=actual)
+        if fixed:
+            invalidate_listings()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled save counts on {fixed} listing(s)."))
@@ -1,7 +1,18 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db import models
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Lower
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
+    def with_email(self, email):
+        """Users whose email matches `email` in any case, looked up through the LOWER(email) index."""
+        return self.alias(email_lower=Lower("email")).filter(email_lower=Lower(models.Value(email)))
+
+    def get_by_natural_key(self, username):
+        return self.with_email(username).get()
+
     def create_user(self, email, password, **extra_fields):
         if not email:
             raise ValueError("Email is required")
@@ -32,3 +43,106 @@ class UserManager(BaseUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
 
         return self.create_user(email, password, **extra_fields)
+
+
+# Columns each ListingSerializer / ListingCardSerializer field reads.
+# `images` comes from a prefetch instead.
+LISTING_FIELD_COLUMNS = {
+    "id": ("id",),
+    "seller": ("seller",),
+    "seller_name": ("seller__user__first_name", "seller__user__last_name"),
+    "seller_verified": ("seller__is_verified",),
+    "seller_image": ("seller__profile_image",),
+    "title": ("title",),
+    "description": ("description",),
+    "price": ("price",),
+    "category": ("category",),
+    "condition": ("condition",),
+    "location": ("location",),
+    "area": ("area",),
+    "status": ("status",),
+    "save_count": ("save_count",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+    "images": (),
+    "primary_image": ("primary_image",),
+}
+
+
+class ListingQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(status="active")
+
+    def with_related(self):
+        """
+        Load everything ListingSerializer touches (seller, seller.user, images)
+        in a fixed number of queries: one joined SELECT plus one prefetch.
+        """
+        return self.select_related("seller__user").prefetch_related("images")
+
+    def with_fields(self, fields, extra=()):
+        """
+        Like with_related(), but select only the columns and relations the
+        given serializer fields need. `extra` names more columns to load,
+        such as the keyset ordering; names that aren't model fields are ignored.
+        """
+        columns = {"id"}
+        for name in fields:
+            columns.update(LISTING_FIELD_COLUMNS[name])
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        columns.update(name for name in extra if name in concrete)
+
+        queryset = self.only(*columns)
+        relations = {column.rsplit("__", 1)[0] for column in columns if "__" in column}
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if "images" in fields:
+            queryset = queryset.prefetch_related("images")
+        return queryset
+
+    def values_for_fields(self, fields, extra=()):
+        """
+        values() counterpart of with_fields() for the fast read path in rows.py:
+        plain dicts carrying the columns the given fields need, plus `extra`
+        (model fields or annotations, such as the keyset ordering).
+        """
+        columns = {"id"}
+        for name in fields:
+            columns.update(LISTING_FIELD_COLUMNS[name])
+        columns.update(extra)
+        return self.values(*sorted(columns))
+
+    def sync_primary_images(self, listing_ids=None, touch=False):
+        """
+        Copy each listing's primary image (its card rendition, where there is
+        one) onto Listing.primary_image, first
+        promoting the oldest image of any listing that has images but no
+        primary. Two to three statements however many listings are covered.
+        Pass `touch=True` to also bump updated_at (a representation change).
+        """
+        from .models import ListingImage
+
+        images = ListingImage.objects.all()
+        listings = self.all()
+        if listing_ids is not None:
+            images = images.filter(listing_id__in=listing_ids)
+            listings = listings.filter(id__in=listing_ids)
+
+        orphaned = list(
+            images.values("listing_id")
+            .annotate(primaries=Count("id", filter=Q(is_primary=True)), first=Min("id"))
+            .filter(primaries=0)
+            .values_list("first", flat=True)
+        )
+        if orphaned:
+            ListingImage.objects.filter(id__in=orphaned).update(is_primary=True)
+
+        changes = {
+            "primary_image": Subquery(
+                ListingImage.objects.filter(listing=OuterRef("pk"), is_primary=True)
+                .values(card=Coalesce("image_card", "image"))[:1]
+            ),
+        }
+        if touch:
+            changes["updated_at"] = timezone.now()
+        return listings.update(**changes)
@@ -0,0 +1,73 @@
+"""
+Per-path middleware stacks.
+
+PathRoutedMiddleware sits at the end of MIDDLEWARE and runs one of two
+stacks behind it: API_MIDDLEWARE for paths under API_PATH_PREFIX, which are
+token-authenticated by DRF and never use sessions, CSRF or messages, and
+SITE_MIDDLEWARE (the full session stack the admin needs) for everything else.
+
+Each stack is built the way Django builds MIDDLEWARE, and the router forwards
+its process_view / process_exception / process_template_response hooks to
+the chosen stack, so e.g. CsrfViewMiddleware behaves exactly as it would if
+it were listed in MIDDLEWARE.
+"""
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class MiddlewareStack:
+    def __init__(self, paths, get_response):
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = get_response
+        for path in reversed(paths):
+            try:
+                middleware = import_string(path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(middleware, "process_view"):
+                self.view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, "process_template_response"):
+                self.template_response_middleware.append(middleware.process_template_response)
+            if hasattr(middleware, "process_exception"):
+                self.exception_middleware.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.handler = handler
+
+
+class PathRoutedMiddleware:
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.api = MiddlewareStack(settings.API_MIDDLEWARE, get_response)
+        self.site = MiddlewareStack(settings.SITE_MIDDLEWARE, get_response)
+
+    def stack_for(self, request):
+        return self.api if request.path_info.startswith(settings.API_PATH_PREFIX) else self.site
+
+    def __call__(self, request):
+        return self.stack_for(request).handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in self.stack_for(request).view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_exception(self, request, exception):
+        for process_exception in self.stack_for(request).exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        for process_template_response in self.stack_for(request).template_response_middleware:
+            response = process_template_response(request, response)
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0015_alter_listing_condition'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='listing',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='listing_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# The SQL is inlined so this migration never changes with search.py.
+from django.db import migrations
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE "BiasharaConnectApp_listing" ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS listing_search_vector_idx ON "BiasharaConnectApp_listing" USING GIN (search_vector)',
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS listing_search_vector_idx",
+    'ALTER TABLE "BiasharaConnectApp_listing" DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS "BiasharaConnectApp_listing_fts" USING fts5(
+        title, description,
+        content='BiasharaConnectApp_listing', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS listing_fts_insert AFTER INSERT ON "BiasharaConnectApp_listing" BEGIN
+        INSERT INTO "BiasharaConnectApp_listing_fts"(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS listing_fts_delete AFTER DELETE ON "BiasharaConnectApp_listing" BEGIN
+        INSERT INTO "BiasharaConnectApp_listing_fts"("BiasharaConnectApp_listing_fts", rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS listing_fts_update AFTER UPDATE OF title, description ON "BiasharaConnectApp_listing" BEGIN
+        INSERT INTO "BiasharaConnectApp_listing_fts"("BiasharaConnectApp_listing_fts", rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO "BiasharaConnectApp_listing_fts"(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """INSERT INTO "BiasharaConnectApp_listing_fts"("BiasharaConnectApp_listing_fts") VALUES ('rebuild')""",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS listing_fts_insert",
+    "DROP TRIGGER IF EXISTS listing_fts_delete",
+    "DROP TRIGGER IF EXISTS listing_fts_update",
+    'DROP TABLE IF EXISTS "BiasharaConnectApp_listing_fts"',
+]
+
+
+def install(apps, schema_editor):
+    """Create the search index and populate it from existing rows."""
+    statements = {"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def uninstall(apps, schema_editor):
+    statements = {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0017_listing_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:15
+
+import cloudinary.models
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def demote_duplicate_primaries(apps, schema_editor):
+    """Keep the oldest primary image per listing so the constraint below can be created."""
+    ListingImage = apps.get_model('BiasharaConnectApp', 'ListingImage')
+    keep = (
+        ListingImage.objects.filter(is_primary=True)
+        .values('listing_id')
+        .annotate(first=Min('id'))
+        .values('first')
+    )
+    ListingImage.objects.filter(is_primary=True).exclude(id__in=keep).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0018_listing_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='primary_image',
+            field=cloudinary.models.CloudinaryField(blank=True, editable=False, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.RunPython(demote_duplicate_primaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='listingimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('listing',), name='unique_primary_image_per_listing'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_save_counts(apps, schema_editor):
+    Listing = apps.get_model('BiasharaConnectApp', 'Listing')
+    SavedListing = apps.get_model('BiasharaConnectApp', 'SavedListing')
+    counts = (
+        SavedListing.objects.filter(listing=OuterRef('pk'))
+        .order_by()
+        .values('listing')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Listing.objects.filter(id__in=SavedListing.objects.values('listing')).update(save_count=Subquery(counts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0019_listing_primary_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='save_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_save_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', '-save_count', '-created_at', '-id'], name='listing_status_popular_idx'),
+        ),
+    ]
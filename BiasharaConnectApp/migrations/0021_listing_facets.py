@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0020_listing_save_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'category', 'condition', 'location', 'area'], name='listing_facets_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='listingfacetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='unique_listing_facet_value'),
+        ),
+    ]
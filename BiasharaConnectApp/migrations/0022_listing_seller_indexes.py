@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0021_listing_facets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['seller', 'status', '-created_at', '-id'], name='listing_seller_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['seller', '-created_at', '-id'], name='listing_seller_all_created_idx'),
+        ),
+        # Drop the single-column FK index only once the composites that replace it exist.
+        migrations.AlterField(
+            model_name='listing',
+            name='seller',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='listings', to='BiasharaConnectApp.sellerprofile'),
+        ),
+    ]
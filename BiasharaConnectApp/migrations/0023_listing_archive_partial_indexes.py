@@ -0,0 +1,147 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:27
+
+import cloudinary.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0022_listing_seller_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('category', models.CharField(choices=[('electronics', 'Electronics'), ('fashion', 'Fashion'), ('home', 'Home & Living'), ('vehicles', 'Vehicles'), ('services', 'Services'), ('agriculture', 'Agriculture')], max_length=30)),
+                ('condition', models.CharField(choices=[('new', 'New'), ('used', 'Used'), ('service', 'Service'), ('fresh', 'Fresh')], max_length=20)),
+                ('location', models.CharField(max_length=100)),
+                ('area', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('deleted', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('primary_image', cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image')),
+                ('save_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedListingImage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('image', cloudinary.models.CloudinaryField(max_length=255, verbose_name='image')),
+                ('is_primary', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedSavedListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('saved_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at', '-id'], name='listing_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', '-created_at', '-id'], name='listing_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['condition', '-created_at', '-id'], name='listing_active_condition_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['location', 'area', '-created_at', '-id'], name='listing_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['price', 'id'], name='listing_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', 'price', 'id'], name='listing_active_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-save_count', '-created_at', '-id'], name='listing_active_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', 'condition', 'location', 'area'], name='listing_active_facets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['seller', '-created_at', '-id'], name='listing_active_seller_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'deleted')), fields=['updated_at', 'id'], name='listing_deleted_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedlisting',
+            name='seller',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_listings', to='BiasharaConnectApp.sellerprofile'),
+        ),
+        migrations.AddField(
+            model_name='archivedlistingimage',
+            name='listing',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='BiasharaConnectApp.archivedlisting'),
+        ),
+        migrations.AddField(
+            model_name='archivedsavedlisting',
+            name='buyer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_saved_listings', to='BiasharaConnectApp.buyerprofile'),
+        ),
+        migrations.AddField(
+            model_name='archivedsavedlisting',
+            name='listing',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_by', to='BiasharaConnectApp.archivedlisting'),
+        ),
+        # The feed indexes above replace these; drop them only once they exist.
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_category_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_condition_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_location_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_status_price_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_category_price_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_status_popular_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_facets_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listing_seller_created_idx',
+        ),
+    ]
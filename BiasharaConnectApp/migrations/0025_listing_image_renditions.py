@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:35
+
+import cloudinary.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0024_image_upload_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingimage',
+            name='image_card',
+            field=cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.AddField(
+            model_name='listingimage',
+            name='image_thumb',
+            field=cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+    ]
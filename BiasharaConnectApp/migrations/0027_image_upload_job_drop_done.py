@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:15
+
+from django.db import migrations, models
+
+
+def delete_done_jobs(apps, schema_editor):
+    """Finished jobs are now deleted as they complete; clear out the ones kept until now."""
+    ImageUploadJob = apps.get_model('BiasharaConnectApp', 'ImageUploadJob')
+    ImageUploadJob.objects.filter(status='done').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0026_user_email_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_done_jobs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='imageuploadjob',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0027_image_upload_job_drop_done'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(condition=models.Q(('status', 'active'), ('price__isnull', True)), fields=['id'], name='listing_active_unpriced_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:46
+
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+
+
+def staging_storage():
+    return FileSystemStorage(
+        location=getattr(settings, 'IMAGE_UPLOAD_STAGING_ROOT', '') or os.path.join(settings.MEDIA_ROOT, 'upload-staging')
+    )
+
+
+def stage_payloads(apps, schema_editor):
+    """Move queued image bytes out of the table into the staging storage."""
+    ImageUploadJob = apps.get_model('BiasharaConnectApp', 'ImageUploadJob')
+    storage = staging_storage()
+    for job in ImageUploadJob.objects.exclude(payload=b'').iterator(chunk_size=50):
+        job.staged_name = storage.save(job.file_name or 'image', ContentFile(bytes(job.payload)))
+        job.save(update_fields=['staged_name'])
+
+
+def unstage_payloads(apps, schema_editor):
+    ImageUploadJob = apps.get_model('BiasharaConnectApp', 'ImageUploadJob')
+    storage = staging_storage()
+    for job in ImageUploadJob.objects.exclude(staged_name='').iterator(chunk_size=50):
+        if storage.exists(job.staged_name):
+            with storage.open(job.staged_name) as staged:
+                job.payload = staged.read()
+            job.save(update_fields=['payload'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0028_listing_unpriced_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageuploadjob',
+            name='staged_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(stage_payloads, unstage_payloads),
+        migrations.RemoveField(
+            model_name='imageuploadjob',
+            name='payload',
+        ),
+    ]
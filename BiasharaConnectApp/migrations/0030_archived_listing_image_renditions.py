@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:50
+
+import cloudinary.models
+from django.db import migrations, models
+
+
+def restore_missing_images(apps, schema_editor):
+    """Images archived before this stored a never-uploaded image as ''; it never finished uploading."""
+    ArchivedListingImage = apps.get_model('BiasharaConnectApp', 'ArchivedListingImage')
+    ArchivedListingImage.objects.filter(image='').update(image=None, upload_status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BiasharaConnectApp', '0029_image_upload_job_staged_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedlistingimage',
+            name='image_card',
+            field=cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.AddField(
+            model_name='archivedlistingimage',
+            name='image_thumb',
+            field=cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.AddField(
+            model_name='archivedlistingimage',
+            name='upload_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedlistingimage',
+            name='image',
+            field=cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.RunPython(restore_missing_images, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone
-from .managers import UserManager
+from django.utils.functional import cached_property
+from .managers import UserManager, ListingQuerySet
 from cloudinary.models import CloudinaryField
 
 
@@ -12,7 +14,8 @@ class User(AbstractBaseUser, PermissionsMixin):
         ('seller', 'Seller')
     )
 
-    email = models.EmailField(unique=True, db_index=True)
+    # Unique in any case through unique_user_email_ci below, which also serves lookups.
+    email = models.EmailField()
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     phone = models.CharField(max_length=20)
@@ -29,9 +32,29 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    class Meta:
+        constraints = [
+            # Registration relies on this rather than a pre-check query (serializers.unique_email).
+            models.UniqueConstraint(
+                Lower('email'),
+                name='unique_user_email_ci',
+                violation_error_message='Email already registered.',
+            ),
+        ]
+
     def __str__(self):
         return self.email
 
+    # Token authentication sets these from the token's claims (authentication.py);
+    # otherwise they are looked up once per instance.
+    @cached_property
+    def seller_profile_id(self):
+        return SellerProfile.objects.filter(user=self).values_list("id", flat=True).first()
+
+    @cached_property
+    def buyer_profile_id(self):
+        return BuyerProfile.objects.filter(user=self).values_list("id", flat=True).first()
+
 
 class BuyerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='buyer_profile')
@@ -75,6 +98,10 @@ class SellerProfile(models.Model):
         return f"{self.business_name} ({self.user.email})"
 
 
+# Partial-index condition for the rows every public read is limited to.
+ACTIVE = models.Q(status='active')
+
+
 class Listing(models.Model):
     STATUS_CHOICES = (
         ('active', 'Active'),
@@ -98,7 +125,8 @@ class Listing(models.Model):
         ('agriculture', 'Agriculture'),
     )
 
-    seller = models.ForeignKey(SellerProfile, on_delete=models.CASCADE, related_name='listings')
+    # Indexed by the seller indexes in Meta.indexes, which lead with seller_id.
+    seller = models.ForeignKey(SellerProfile, on_delete=models.CASCADE, related_name='listings', db_index=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
     price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
@@ -110,23 +138,53 @@ class Listing(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized card-size rendition of the primary ListingImage, so feeds never
+    # need to touch ListingImage. Maintained by ListingQuerySet.sync_primary_images().
+    primary_image = CloudinaryField('image', blank=True, null=True, editable=False)
+
+    # Number of SavedListing rows, kept with F() updates by toggle_save_listing.
+    # `manage.py reconcile_save_counts` repairs any drift.
+    save_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ListingQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        # Every public read is limited to status='active', so the hot indexes are
+        # partial: inactive and soft-deleted rows never enter them, and they stay
+        # sized to the live catalogue however large the table grows.
         indexes = [
-            models.Index(fields=['status', 'category']),
+            # Backs keyset pagination of the public feed: (created_at, id) seek.
+            models.Index(fields=['-created_at', '-id'], name='listing_active_created_idx', condition=ACTIVE),
+            # Feed filters, each followed by the keyset columns of the sort it serves.
+            models.Index(fields=['category', '-created_at', '-id'], name='listing_active_category_idx', condition=ACTIVE),
+            models.Index(fields=['condition', '-created_at', '-id'], name='listing_active_condition_idx', condition=ACTIVE),
+            models.Index(fields=['location', 'area', '-created_at', '-id'], name='listing_active_location_idx', condition=ACTIVE),
+            models.Index(fields=['price', 'id'], name='listing_active_price_idx', condition=ACTIVE),
+            models.Index(fields=['category', 'price', 'id'], name='listing_active_cat_price_idx', condition=ACTIVE),
+            # The unpriced tail of the price sorts, which come NULLS LAST in both directions.
+            models.Index(fields=['id'], name='listing_active_unpriced_idx', condition=ACTIVE & models.Q(price__isnull=True)),
+            models.Index(fields=['-save_count', '-created_at', '-id'], name='listing_active_popular_idx', condition=ACTIVE),
+            # Holds every facet column, so facet GROUP BYs are index-only scans.
+            models.Index(fields=['category', 'condition', 'location', 'area'], name='listing_active_facets_idx', condition=ACTIVE),
+            # Seller storefront (active only) and "my listings" (every status).
+            models.Index(fields=['seller', '-created_at', '-id'], name='listing_active_seller_idx', condition=ACTIVE),
+            models.Index(fields=['seller', '-created_at', '-id'], name='listing_seller_all_created_idx'),
+            # Finds soft-deleted listings due for archiving (see archive.py).
+            models.Index(fields=['updated_at', 'id'], name='listing_deleted_updated_idx', condition=models.Q(status='deleted')),
         ]
 
     def activate(self):
         self.status = 'active'
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
 
     def deactivate(self):
         self.status = 'inactive'
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
 
     def soft_delete(self):
         self.status = 'deleted'
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
 
     def __str__(self):
         return self.title
@@ -135,9 +193,39 @@ class Listing(models.Model):
 class ListingImage(models.Model):
     listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='images')
 
+    UPLOAD_STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+
     # Store Cloudinary URL instead of CloudinaryField
-    image = CloudinaryField('image', folder='BiasharaConnect/listing')
+    # Empty while the upload is queued (see uploads.py); upload_status tracks it.
+    # `image` holds the full-size rendition; images stored before renditions
+    # existed have no thumb/card and are served at full size.
+    image = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
+    image_thumb = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
+    image_card = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
     is_primary = models.BooleanField(default=False)
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default='ready')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['listing'],
+                condition=models.Q(is_primary=True),
+                name='unique_primary_image_per_listing',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Flagging a new primary demotes the old one first, so the constraint holds.
+        with transaction.atomic():
+            if self.is_primary:
+                ListingImage.objects.filter(
+                    listing_id=self.listing_id, is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Image for {self.listing.title}"
@@ -153,3 +241,116 @@ class SavedListing(models.Model):
 
     def __str__(self):
         return f"{self.buyer.user.email} saved {self.listing.title}"
+
+
+class ListingFacetCount(models.Model):
+    """Active listings per facet value, used when LISTING_FACETS_PRECOMPUTED is on (see facets.py)."""
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='unique_listing_facet_value'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+# =========================
+# Image Upload Queue
+# =========================
+class ImageUploadJob(models.Model):
+    """
+    An image waiting to be uploaded to storage by `manage.py process_image_uploads`.
+    The file waits in the staging storage under `staged_name`, so any worker
+    sharing it can run the job; the row is deleted once the upload is done.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('failed', 'Failed'),
+    )
+
+    # Exactly one target: a listing image, or a seller's profile image.
+    listing_image = models.OneToOneField(
+        ListingImage, on_delete=models.CASCADE, null=True, blank=True, related_name='upload_job'
+    )
+    seller = models.ForeignKey(
+        SellerProfile, on_delete=models.CASCADE, null=True, blank=True, related_name='image_upload_jobs'
+    )
+    folder = models.CharField(max_length=255)
+    file_name = models.CharField(max_length=255)
+    staged_name = models.CharField(max_length=255, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # The workers' claim query; finished jobs never enter it.
+            models.Index(
+                fields=['available_at', 'id'], name='upload_job_due_idx',
+                condition=models.Q(status__in=['pending', 'processing']),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.file_name} ({self.status})"
+
+
+# =========================
+# Archive
+# =========================
+# Soft-deleted listings are moved here by `manage.py archive_deleted_listings`
+# (see archive.py), keeping their original ids, so the live tables and their
+# indexes only hold listings that can still come back.
+class ArchivedListing(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    seller = models.ForeignKey(SellerProfile, on_delete=models.CASCADE, related_name='archived_listings')
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    category = models.CharField(max_length=30, choices=Listing.CATEGORY_CHOICES)
+    condition = models.CharField(max_length=20, choices=Listing.CONDITION_CHOICES)
+    location = models.CharField(max_length=100)
+    area = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=Listing.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    primary_image = CloudinaryField('image', blank=True, null=True)
+    save_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedListingImage(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    listing = models.ForeignKey(ArchivedListing, on_delete=models.CASCADE, related_name='images')
+    # Mirrors ListingImage: NULL while an upload was still pending or failed.
+    image = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
+    image_thumb = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
+    image_card = CloudinaryField('image', folder='BiasharaConnect/listing', blank=True, null=True)
+    is_primary = models.BooleanField(default=False)
+    upload_status = models.CharField(max_length=10, choices=ListingImage.UPLOAD_STATUS_CHOICES, default='ready')
+
+    def __str__(self):
+        return f"Image for archived {self.listing_id}"
+
+
+class ArchivedSavedListing(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    buyer = models.ForeignKey(BuyerProfile, on_delete=models.CASCADE, related_name='archived_saved_listings')
+    listing = models.ForeignKey(ArchivedListing, on_delete=models.CASCADE, related_name='saved_by')
+    saved_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Buyer {self.buyer_id} saved archived {self.listing_id}"
@@ -0,0 +1,166 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+# =========================
+# Keyset (Cursor) Pagination
+# =========================
+class KeysetPagination(BasePagination):
+    """
+    Seek pagination over a fixed, unique ordering.
+
+    The cursor is an opaque token holding the ordering values of the last row
+    of the previous page, so page N is the same index range scan as page 1
+    instead of an ever-growing OFFSET. Nullable model fields sort NULLS LAST
+    in either direction, so rows without a value end the ordering instead of
+    dropping out of it.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 20
+    max_limit = 100
+
+    def __init__(self, ordering=("-created_at", "-id")):
+        self.ordering = tuple(ordering)
+        self.next_cursor = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        queryset = queryset.order_by(*self._order_by(queryset.model))
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._seek_filter(queryset.model, self.decode_cursor(cursor)))
+
+        # Fetch one extra row to know whether there is a next page.
+        rows = list(queryset[:limit + 1])
+        self.next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.next_cursor, "results": data})
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit < 1:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def _order_by(self, model):
+        order_by = []
+        for name in self.ordering:
+            field_name = name.lstrip("-")
+            if self._nullable(model, field_name):
+                expression = F(field_name)
+                order_by.append(
+                    expression.desc(nulls_last=True) if name.startswith("-") else expression.asc(nulls_last=True)
+                )
+            else:
+                order_by.append(name)
+        return order_by
+
+    @staticmethod
+    def _nullable(model, field_name):
+        try:
+            return model._meta.get_field(field_name).null
+        except FieldDoesNotExist:
+            return False
+
+    # -------------------------
+    # Cursor encoding
+    # -------------------------
+    def encode_cursor(self, row):
+        # Rows are model instances, or dicts on the values() fast path.
+        get = row.__getitem__ if isinstance(row, dict) else lambda name: getattr(row, name)
+        values = [self._to_json(get(name.lstrip("-"))) for name in self.ordering]
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+        # Cursors only ever hold strings, numbers and nulls (see _to_json).
+        if not all(
+            value is None or isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values
+        ):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+        return values
+
+    @staticmethod
+    def _to_json(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    # -------------------------
+    # Seek predicate
+    # -------------------------
+    def _seek_filter(self, model, values):
+        """
+        Build `(a, b, c) < (x, y, z)` as
+        `a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z)`,
+        flipping each comparison for ascending fields.
+
+        A nullable field sorts NULLS LAST: past a value `x` come the rows
+        greater (or less) than `x` and then every NULL; past a NULL, only
+        further NULLs, ordered by the fields that follow.
+        """
+        fields = []
+        for name, raw in zip(self.ordering, values):
+            field_name = name.lstrip("-")
+            nullable = self._nullable(model, field_name)
+            if raw is None and not nullable:
+                raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+            value = None if raw is None else self._to_python(model, field_name, raw)
+            fields.append((field_name, name.startswith("-"), nullable, value))
+
+        condition = Q()
+        for index, (field_name, descending, nullable, value) in enumerate(fields):
+            if value is None:
+                # Nothing sorts after NULL in this field itself.
+                continue
+            lookup = "lt" if descending else "gt"
+            branch = Q(**{f"{field_name}__{lookup}": value})
+            if nullable:
+                branch |= Q(**{f"{field_name}__isnull": True})
+            for prev_name, _, _, prev_value in fields[:index]:
+                branch &= Q(**{f"{prev_name}__isnull": True} if prev_value is None else {prev_name: prev_value})
+            condition |= branch
+        return condition
+
+    def _to_python(self, model, field_name, raw):
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return raw
+        try:
+            return field.to_python(raw)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
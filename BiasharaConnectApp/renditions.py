@@ -0,0 +1,55 @@
+"""
+Image normalization for uploads.
+
+Every uploaded photo is decoded once, rotated upright from its EXIF
+orientation and re-encoded at each size in IMAGE_RENDITIONS (longest side,
+never upscaled) as IMAGE_RENDITION_FORMAT. Re-encoding from pixels drops all
+metadata: EXIF (including GPS), XMP and embedded thumbnails.
+"""
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+class UnprocessableImage(Exception):
+    """The upload is not an image Pillow can decode; retrying will not help."""
+
+
+def render_renditions(data, sizes=None):
+    """
+    Return `{name: (bytes, extension)}` for each `{name: max_side}` in `sizes`
+    (IMAGE_RENDITIONS by default). `data` is the image's bytes or a binary file.
+    """
+    sizes = sizes or settings.IMAGE_RENDITIONS
+    image_format = settings.IMAGE_RENDITION_FORMAT
+    try:
+        with Image.open(BytesIO(data) if isinstance(data, (bytes, bytearray)) else data) as source:
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise UnprocessableImage(str(exc)) from exc
+
+    image = _normalize_mode(image, image_format)
+    renditions = {}
+    for name, max_side in sizes.items():
+        rendition = image.copy()
+        rendition.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        rendition.save(buffer, format=image_format, quality=settings.IMAGE_RENDITION_QUALITY)
+        renditions[name] = (buffer.getvalue(), EXTENSIONS[image_format])
+    return renditions
+
+
+def _normalize_mode(image, image_format):
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if has_alpha and image_format == "WEBP":
+        return image.convert("RGBA")
+    if has_alpha:
+        # JPEG has no alpha channel: flatten onto white.
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image.convert("RGBA"), mask=image.convert("RGBA").getchannel("A"))
+        return background
+    return image.convert("RGB")
@@ -0,0 +1,120 @@
+"""
+Full-text search over Listing.title and Listing.description.
+
+Production (PostgreSQL) keeps a weighted `tsvector` in a generated column with
+a GIN index; local and test runs (SQLite) keep an FTS5 external-content table
+in sync through triggers. Both live outside the Django model so the vector is
+never loaded by ordinary listing queries, and both are maintained by the
+database itself, so every write path (save, bulk_create, queryset.update)
+stays in sync.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+LISTING_TABLE = "BiasharaConnectApp_listing"
+SQLITE_FTS_TABLE = "BiasharaConnectApp_listing_fts"
+POSTGRES_SEARCH_CONFIG = "english"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Decimal places search_rank is rounded to. Relevance pages are keyset-paginated
+# on it, so the value the cursor carries must compare equal to the one the
+# database recomputes; a raw float4 / bm25 score does not survive that trip.
+RANK_PRECISION = 6
+
+
+# =========================
+# Schema
+# =========================
+# Created by migration 0018; kept here for the post_migrate hook below.
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_fts_insert AFTER INSERT ON "{LISTING_TABLE}" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_fts_delete AFTER DELETE ON "{LISTING_TABLE}" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"("{SQLITE_FTS_TABLE}", rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_fts_update AFTER UPDATE OF title, description ON "{LISTING_TABLE}" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"("{SQLITE_FTS_TABLE}", rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO "{SQLITE_FTS_TABLE}"(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def ensure_sqlite_triggers(sender, using="default", **kwargs):
+    """
+    post_migrate hook. SQLite migrations rebuild a table (dropping its
+    triggers) for most column changes, so put the sync triggers back.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_FTS_TABLE])
+        if cursor.fetchone() is None:
+            return
+        for statement in SQLITE_TRIGGERS:
+            cursor.execute(statement)
+
+
+# =========================
+# Querying
+# =========================
+def search_listings(queryset, query):
+    """
+    Restrict a listing queryset to rows matching `query`, annotated with
+    `search_rank` (higher is more relevant).
+    """
+    vendor = connections[queryset.db].vendor
+    column = f'"{LISTING_TABLE}"."id"'
+
+    if vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)"
+        vector = f'"{LISTING_TABLE}"."search_vector"'
+        return queryset.filter(
+            RawSQL(f"{vector} @@ {tsquery}", [query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"round(ts_rank_cd({vector}, {tsquery})::numeric, {RANK_PRECISION})::float8",
+                [query], output_field=FloatField(),
+            )
+        )
+
+    if vendor == "sqlite":
+        match = to_fts5_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            RawSQL(
+                f'{column} IN (SELECT rowid FROM "{SQLITE_FTS_TABLE}" WHERE "{SQLITE_FTS_TABLE}" MATCH %s)',
+                [match], output_field=BooleanField(),
+            )
+        ).annotate(
+            # bm25() is lower-is-better; weight title matches twice as high as description.
+            search_rank=RawSQL(
+                f'(SELECT round(-bm25("{SQLITE_FTS_TABLE}", 2.0, 1.0), {RANK_PRECISION}) FROM "{SQLITE_FTS_TABLE}" '
+                f'WHERE "{SQLITE_FTS_TABLE}" MATCH %s AND rowid = {column})',
+                [match], output_field=FloatField(),
+            )
+        )
+
+    # Unindexed fallback for other backends.
+    return queryset.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def to_fts5_query(query):
+    """Quote each word so user input can never be parsed as FTS5 syntax; words are ANDed."""
+    return " ".join(f'"{token}"' for token in TOKEN_RE.findall(query))
@@ -1,7 +1,25 @@
+from contextlib import contextmanager
+
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from .models import User, BuyerProfile, SellerProfile, ListingImage, Listing, SavedListing
+from .uploads import enqueue_listing_images
+
+
+@contextmanager
+def unique_email(email):
+    """
+    Report a registration that collides with an existing email (in any case)
+    as a validation error on `email`. The unique constraint does the check, so
+    concurrent signups can't both get through.
+    """
+    try:
+        yield
+    except IntegrityError:
+        if User.objects.with_email(email).exists():
+            raise serializers.ValidationError({"email": ["Email already registered."]})
+        raise
 
 
 # =========================
@@ -16,11 +34,6 @@ class BuyerRegisterSerializer(serializers.Serializer):
     confirm_password = serializers.CharField(write_only=True)
     location = serializers.CharField(max_length=100)
 
-    def validate_email(self, email):
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError("Email already registered.")
-        return email
-
     def validate(self, data):
         if data["password"] != data["confirm_password"]:
             raise serializers.ValidationError({"confirm_password": "Passwords do not match."})
@@ -29,15 +42,16 @@ class BuyerRegisterSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         validated_data.pop("confirm_password")
-        user = User.objects.create_user(
-            email=validated_data["email"],
-            password=validated_data["password"],
-            first_name=validated_data["first_name"],
-            last_name=validated_data["last_name"],
-            phone=validated_data["phone"],
-            role="buyer",
-        )
-        BuyerProfile.objects.create(user=user, location=validated_data["location"])
+        with unique_email(validated_data["email"]), transaction.atomic():
+            user = User.objects.create_user(
+                email=validated_data["email"],
+                password=validated_data["password"],
+                first_name=validated_data["first_name"],
+                last_name=validated_data["last_name"],
+                phone=validated_data["phone"],
+                role="buyer",
+            )
+            BuyerProfile.objects.create(user=user, location=validated_data["location"])
         return user
 
 
@@ -59,59 +73,122 @@ class SellerRegisterSerializer(serializers.Serializer):
     bio = serializers.CharField(required=False, allow_blank=True)
     profile_image = serializers.URLField(required=False, allow_null=True)
 
-    def validate_email(self, email):
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError("Email already registered.")
-        return email
-
     def validate(self, data):
         if data["password"] != data["confirm_password"]:
             raise serializers.ValidationError({"confirm_password": "Passwords do not match."})
         validate_password(data["password"])
         return data
 
-    @transaction.atomic
     def create(self, validated_data):
         profile_image = validated_data.pop("profile_image", None)
         bio = validated_data.pop("bio", "")
         validated_data.pop("confirm_password")
 
-        user = User.objects.create_user(
-            email=validated_data["email"],
-            password=validated_data["password"],
-            first_name=validated_data["first_name"],
-            last_name=validated_data["last_name"],
-            phone=validated_data["phone"],
-            role="seller",
-        )
+        with unique_email(validated_data["email"]), transaction.atomic():
+            user = User.objects.create_user(
+                email=validated_data["email"],
+                password=validated_data["password"],
+                first_name=validated_data["first_name"],
+                last_name=validated_data["last_name"],
+                phone=validated_data["phone"],
+                role="seller",
+            )
 
-        SellerProfile.objects.create(
-            user=user,
-            business_name=validated_data["business_name"],
-            business_type=validated_data["business_type"],
-            business_category=validated_data["business_category"],
-            business_location=validated_data["business_location"],
-            bio=bio,
-            profile_image=profile_image,
-        )
+            SellerProfile.objects.create(
+                user=user,
+                business_name=validated_data["business_name"],
+                business_type=validated_data["business_type"],
+                business_category=validated_data["business_category"],
+                business_location=validated_data["business_location"],
+                bio=bio,
+                profile_image=profile_image,
+            )
         return user
 
 
+# =========================
+# Seller Header Serializer
+# =========================
+class SellerHeaderSerializer(serializers.ModelSerializer):
+    """Public storefront header for a seller."""
+
+    profile_image = serializers.URLField(read_only=True)
+
+    class Meta:
+        model = SellerProfile
+        fields = (
+            "id", "business_name", "business_type", "business_category",
+            "business_location", "is_verified", "profile_image",
+        )
+
+
 # =========================
 # Listing Image Serializer
 # =========================
 class ListingImageSerializer(serializers.ModelSerializer):
+    """`image` is the full-size rendition; `thumbnail` and `card` fall back to it for older images."""
+
     image = serializers.URLField(required=False, allow_null=True)
+    thumbnail = serializers.SerializerMethodField()
+    card = serializers.SerializerMethodField()
 
     class Meta:
         model = ListingImage
-        fields = ("id", "image", "is_primary")
+        fields = ("id", "image", "thumbnail", "card", "is_primary", "upload_status")
+
+    def get_thumbnail(self, obj):
+        return rendition_name(obj.image_thumb, obj.image)
+
+    def get_card(self, obj):
+        return rendition_name(obj.image_card, obj.image)
+
+
+def rendition_name(rendition, image):
+    value = rendition or image
+    return None if value is None else str(value)
+
+
+class ListingImageUploadSerializer(serializers.ModelSerializer):
+    """An image's upload progress, for the listing owner."""
+
+    image = serializers.URLField(read_only=True)
+    attempts = serializers.SerializerMethodField()
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ListingImage
+        fields = ("id", "image", "is_primary", "upload_status", "attempts", "error")
+
+    def _job(self, obj):
+        return getattr(obj, "upload_job", None)
+
+    def get_attempts(self, obj):
+        job = self._job(obj)
+        return job.attempts if job else 0
+
+    def get_error(self, obj):
+        job = self._job(obj)
+        return job.last_error if job and obj.upload_status == "failed" else None
+
+
+# =========================
+# Sparse Fieldsets
+# =========================
+class DynamicFieldsMixin:
+    """Takes an optional `fields` kwarg limiting which declared fields are serialized."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 # =========================
 # Listing Serializer
 # =========================
-class ListingSerializer(serializers.ModelSerializer):
+class ListingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = ListingImageSerializer(many=True, read_only=True)
     seller_name = serializers.SerializerMethodField()
     seller_verified = serializers.BooleanField(source="seller.is_verified", read_only=True)
@@ -122,9 +199,9 @@ class ListingSerializer(serializers.ModelSerializer):
         fields = (
             "id", "seller", "seller_name", "seller_verified", "seller_image",
             "title", "description", "price", "category", "condition",
-            "location", "area", "status", "created_at", "updated_at", "images"
+            "location", "area", "status", "save_count", "created_at", "updated_at", "images"
         )
-        read_only_fields = ("seller", "status", "created_at", "updated_at")
+        read_only_fields = ("seller", "status", "save_count", "created_at", "updated_at")
 
     def get_seller_name(self, obj):
         if obj.seller and obj.seller.user:
@@ -132,6 +209,23 @@ class ListingSerializer(serializers.ModelSerializer):
         return "Seller"
 
 
+# =========================
+# Listing Card Serializer
+# =========================
+class ListingCardSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact representation for grid views: primary image only, no description or seller details."""
+
+    seller_verified = serializers.BooleanField(source="seller.is_verified", read_only=True)
+    primary_image = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Listing
+        fields = (
+            "id", "title", "price", "condition", "location", "area",
+            "seller_verified", "primary_image",
+        )
+
+
 # =========================
 # Saved Listing Serializer
 # =========================
@@ -168,29 +262,25 @@ class ListingCreateSerializer(serializers.ModelSerializer):
             "images",
         )
 
+    @transaction.atomic
     def create(self, validated_data):
         request = self.context.get("request")
         images_data = validated_data.pop("images", [])
 
         # Get seller safely
-        if not hasattr(request.user, "seller_profile"):
+        seller_id = request.user.seller_profile_id
+        if seller_id is None:
             raise serializers.ValidationError("User does not have a seller profile.")
 
-        seller = request.user.seller_profile
-
         # Create listing
         listing = Listing.objects.create(
-            seller=seller,
+            seller_id=seller_id,
             **validated_data
         )
 
-        # Create images
-        for index, image in enumerate(images_data):
-            ListingImage.objects.create(
-                listing=listing,
-                image=image,
-                is_primary=(index == 0)  # first image = primary
-            )
+        # Queue images (first image = primary); they are uploaded off the request path (see uploads.py)
+        if images_data:
+            enqueue_listing_images(listing, images_data)
 
         return listing
 
@@ -201,3 +291,51 @@ class ListingCreateSerializer(serializers.ModelSerializer):
             instance.images.all(), many=True
         ).data
         return representation
+
+
+# =========================
+# Listing Import Serializer
+# =========================
+class ListingImportSerializer(ListingCreateSerializer):
+    """One row of a bulk import: ListingCreateSerializer's rules, without images."""
+
+    images = None
+
+    class Meta(ListingCreateSerializer.Meta):
+        fields = tuple(name for name in ListingCreateSerializer.Meta.fields if name not in ("id", "images"))
+
+
+# =========================
+# Listing Bulk Status Serializers
+# =========================
+class ListingBulkFilterSerializer(serializers.Serializer):
+    """Selects listings by attribute for a bulk status change."""
+
+    status = serializers.ChoiceField(choices=Listing.STATUS_CHOICES, required=False)
+    category = serializers.ChoiceField(choices=Listing.CATEGORY_CHOICES, required=False)
+    condition = serializers.ChoiceField(choices=Listing.CONDITION_CHOICES, required=False)
+    location = serializers.CharField(max_length=100, required=False)
+    area = serializers.CharField(max_length=100, required=False)
+
+    def validate(self, data):
+        # An empty filter would select every listing the caller can see.
+        if not data:
+            raise serializers.ValidationError("Filter on at least one of: " + ", ".join(self.fields) + ".")
+        return data
+
+
+class ListingBulkStatusSerializer(serializers.Serializer):
+    """Target status plus either explicit `ids` or a `filter`."""
+
+    MAX_IDS = 1000
+
+    status = serializers.ChoiceField(choices=Listing.STATUS_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_IDS
+    )
+    filter = ListingBulkFilterSerializer(required=False)
+
+    def validate(self, data):
+        if ("ids" in data) == ("filter" in data):
+            raise serializers.ValidationError("Provide either ids or filter.")
+        return data
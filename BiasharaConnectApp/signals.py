@@ -0,0 +1,121 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .cache import invalidate_listings, invalidate_seller_header
+from .facets import PRECOMPUTED_FACETS, listing_facet_values, adjust_facet_counts
+from .models import User, SellerProfile, Listing, ListingImage, ImageUploadJob
+from .uploads import delete_staged
+
+
+# =========================
+# Listing cache invalidation
+# =========================
+# Covers Listing.activate / deactivate / soft_delete too, since they save().
+# Invalidating on commit keeps a concurrent reader from caching pre-commit
+# rows after the invalidation has already happened.
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def invalidate_listing_cache(sender, instance, **kwargs):
+    # Read the pk now: Django clears it on deleted instances before commit.
+    listing_id = instance.pk
+    transaction.on_commit(lambda: invalidate_listings([listing_id]))
+
+
+@receiver(post_save, sender=ListingImage)
+@receiver(post_delete, sender=ListingImage)
+def invalidate_listing_image_cache(sender, instance, **kwargs):
+    listing_id = instance.listing_id
+    transaction.on_commit(lambda: invalidate_listings([listing_id]))
+
+
+# Seller fields are embedded in every listing representation and the storefront header.
+@receiver(post_save, sender=SellerProfile)
+def invalidate_seller_listings_cache(sender, instance, created, **kwargs):
+    if created:
+        return
+    seller_id = instance.pk
+    transaction.on_commit(lambda: invalidate_seller_header(seller_id))
+    listing_ids = list(instance.listings.values_list("id", flat=True))
+    if listing_ids:
+        transaction.on_commit(lambda: invalidate_listings(listing_ids))
+
+
+@receiver(post_save, sender=User)
+def invalidate_seller_name_cache(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.role != "seller":
+        return
+    if update_fields is not None and not {"first_name", "last_name"} & set(update_fields):
+        return
+    listing_ids = list(Listing.objects.filter(seller__user=instance).values_list("id", flat=True))
+    if listing_ids:
+        transaction.on_commit(lambda: invalidate_listings(listing_ids))
+
+
+# =========================
+# Primary image / freshness
+# =========================
+# Keep Listing.primary_image in step with its images (promoting another image
+# when the primary goes away) and touch updated_at, which the feed's
+# ETag / Last-Modified are derived from.
+@receiver(post_save, sender=ListingImage)
+@receiver(post_delete, sender=ListingImage)
+def sync_listing_primary_image(sender, instance, **kwargs):
+    Listing.objects.sync_primary_images([instance.listing_id], touch=True)
+
+
+# =========================
+# Precomputed facet counts
+# =========================
+FACET_TRACKED_FIELDS = {"status", *PRECOMPUTED_FACETS}
+
+
+@receiver(pre_save, sender=Listing)
+def remember_listing_facets(sender, instance, update_fields=None, **kwargs):
+    if not settings.LISTING_FACETS_PRECOMPUTED:
+        return
+    if update_fields is not None and not FACET_TRACKED_FIELDS & set(update_fields):
+        return
+    before = ()
+    if instance.pk is not None:
+        stored = Listing.objects.filter(pk=instance.pk).only("status", *PRECOMPUTED_FACETS).first()
+        if stored is not None:
+            before = listing_facet_values(stored)
+    instance._facets_before = before
+
+
+@receiver(post_save, sender=Listing)
+def update_listing_facet_counts(sender, instance, **kwargs):
+    before = instance.__dict__.pop("_facets_before", None)
+    if before is not None:
+        adjust_facet_counts(before, listing_facet_values(instance))
+
+
+@receiver(post_delete, sender=Listing)
+def remove_listing_facet_counts(sender, instance, **kwargs):
+    if settings.LISTING_FACETS_PRECOMPUTED:
+        adjust_facet_counts(listing_facet_values(instance), ())
+
+
+# =========================
+# Authenticated user cache
+# =========================
+# Any save may change is_active or role; bumping the user's auth version is
+# cheaper than working out whether it did, and reaches every process.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user_cache(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+
+# =========================
+# Image upload queue
+# =========================
+# Finished, pruned or cascaded away: the staged file is no longer needed.
+@receiver(post_delete, sender=ImageUploadJob)
+def delete_staged_upload(sender, instance, **kwargs):
+    staged_name = instance.staged_name
+    transaction.on_commit(lambda: delete_staged([staged_name]))
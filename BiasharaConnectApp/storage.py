@@ -0,0 +1,70 @@
+"""
+Image storage backends for the upload queue (see uploads.py).
+
+A backend takes a file and a folder and returns the value to store in a
+CloudinaryField. IMAGE_STORAGE_BACKEND picks the class; the local filesystem
+backend stands in for Cloudinary in development and tests. Queued files wait
+in the staging storage until a worker picks them up.
+"""
+import os
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from cloudinary import uploader
+from cloudinary.models import CLOUDINARY_FIELD_DB_RE
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+
+
+class ImageStorage(ABC):
+    @abstractmethod
+    def upload(self, file, folder):
+        """Store `file` under `folder` and return the stored name."""
+
+    @abstractmethod
+    def delete(self, name):
+        """Remove a previously stored `name`; used to clean up after a failed write."""
+
+
+class CloudinaryImageStorage(ImageStorage):
+    def upload(self, file, folder):
+        resource = uploader.upload_resource(
+            file, folder=folder, resource_type="image", quality="auto", fetch_format="auto",
+        )
+        # The same "image/upload/v<version>/<public_id>.<format>" value
+        # CloudinaryField stores when it uploads a file itself.
+        return resource.get_prep_value()
+
+    def delete(self, name):
+        parts = re.match(CLOUDINARY_FIELD_DB_RE, name)
+        uploader.destroy(parts["public_id"], resource_type=parts["resource_type"] or "image", invalidate=True)
+
+
+class LocalImageStorage(ImageStorage):
+    def __init__(self, location=None):
+        # No location means MEDIA_ROOT, read lazily so settings overrides apply.
+        self.storage = FileSystemStorage(location=location)
+
+    def upload(self, file, folder):
+        return self.storage.save(os.path.join(folder, os.path.basename(file.name)), file)
+
+    def delete(self, name):
+        self.storage.delete(name)
+
+
+def get_image_storage():
+    return _load_storage(settings.IMAGE_STORAGE_BACKEND)
+
+
+def get_staging_storage():
+    """Where queued uploads wait for a worker (IMAGE_UPLOAD_STAGING_ROOT)."""
+    return FileSystemStorage(
+        location=settings.IMAGE_UPLOAD_STAGING_ROOT or os.path.join(settings.MEDIA_ROOT, "upload-staging")
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_storage(path):
+    return import_string(path)()
@@ -0,0 +1,184 @@
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import clear_user_cache, invalidate_cached_user, user_version_key
+from .models import User, BuyerProfile, SellerProfile, SavedListing
+from .test_queries import make_seller, make_buyer, make_listings
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class JWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_user_cache()
+        self.client = APIClient()
+        self.seller = make_seller()
+
+    def login(self, email="seller@example.com"):
+        response = self.client.post(reverse("auth:login"), {"email": email, "password": "Str0ng-pass!"}, format="json")
+        access = response.json()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return AccessToken(access)
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        lookup = f'FROM "{User._meta.db_table}"'
+        return response, [query["sql"] for query in queries if lookup in query["sql"]]
+
+    def test_token_carries_role_and_profile_ids(self):
+        token = self.login()
+        self.assertEqual(token["role"], "seller")
+        self.assertEqual(token["seller_id"], self.seller.id)
+        self.assertIsNone(token["buyer_id"])
+
+    def test_login_matches_email_in_any_case(self):
+        token = self.login("Seller@Example.com")
+        self.assertEqual(token["user_id"], str(self.seller.user_id))
+
+    def test_requests_without_a_token_are_anonymous(self):
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 401)
+
+    def test_user_is_looked_up_once_per_process(self):
+        self.login()
+        response, queries = self.user_queries(reverse("auth:my_listings"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.user_queries(reverse("auth:my_listings"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.login()
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 200)
+        user = self.seller.user
+        user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 401)
+
+    def test_deactivation_saved_by_another_process_takes_effect(self):
+        self.login()
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 200)
+        # Another worker's save: the row changes and its signal bumps the
+        # shared version, but this process's entry is left in place.
+        User.objects.filter(pk=self.seller.user_id).update(is_active=False)
+        cache.set(user_version_key(self.seller.user_id), "bumped elsewhere", timeout=None)
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 401)
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=30)
+    def test_shared_version_expires(self):
+        self.login()
+        self.client.get(reverse("auth:my_listings"))
+        key = user_version_key(self.seller.user_id)
+        self.assertIsNotNone(cache.get(key))
+        with mock.patch("time.time", return_value=time.time() + 30 * 10 + 1):
+            self.assertIsNone(cache.get(key))
+
+    def test_losing_the_shared_version_forces_a_reload(self):
+        self.login()
+        self.client.get(reverse("auth:my_listings"))
+        cache.delete(user_version_key(self.seller.user_id))
+        response, queries = self.user_queries(reverse("auth:my_listings"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+
+    def test_token_issued_before_a_role_change_is_refused(self):
+        self.login()
+        self.client.get(reverse("auth:my_listings"))
+        # .update() sends no signal, so the caller invalidates.
+        User.objects.filter(pk=self.seller.user_id).update(role="buyer")
+        invalidate_cached_user(self.seller.user_id)
+        response = self.client.get(reverse("auth:my_listings"))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_stale")
+
+    def test_buyer_profile_comes_from_the_token(self):
+        listing = make_listings(self.seller, 1)[0]
+        buyer = make_buyer()
+        self.login("buyer@example.com")
+        response = self.client.post(reverse("auth:toggle_save_listing", args=[listing.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(SavedListing.objects.filter(buyer=buyer, listing=listing).exists())
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], PASSWORD_HASH_ITERATIONS=1000)
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_seller().user
+
+    def login(self):
+        return self.client.post(reverse("auth:login"), {"email": self.user.email, "password": "Str0ng-pass!"})
+
+    def test_passwords_are_hashed_at_the_configured_cost(self):
+        self.assertTrue(make_password("secret").startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_rehashes_at_the_configured_cost(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password("Str0ng-pass!", hasher="pbkdf2_sha1"))
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_benchmark_reports_each_cost(self):
+        out = StringIO()
+        call_command("benchmark_login", iterations=[500], logins=1, stdout=out)
+        self.assertIn("500", out.getvalue())
+        self.assertIn("1,000", out.getvalue())
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], PASSWORD_HASH_ITERATIONS=1000)
+class RegistrationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def register_buyer(self, email):
+        payload = {
+            "first_name": "John", "last_name": "Otieno", "email": email, "phone": "+254700000001",
+            "password": "Str0ng-pass!", "confirm_password": "Str0ng-pass!", "location": "Mombasa",
+        }
+        return self.client.post(reverse("auth:register_buyer"), payload, format="json")
+
+    def test_registration_makes_no_pre_check_query(self):
+        # Savepoint, user INSERT, profile INSERT, release.
+        with self.assertNumQueries(4):
+            response = self.register_buyer("new@example.com")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(BuyerProfile.objects.filter(user__email="new@example.com").exists())
+
+    def test_duplicate_email_in_any_case_is_rejected(self):
+        self.register_buyer("new@example.com")
+        response = self.register_buyer("NEW@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"email": ["Email already registered."]})
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_seller_cannot_reuse_a_buyer_email(self):
+        self.register_buyer("new@example.com")
+        payload = {
+            "first_name": "Jane", "last_name": "Wanjiru", "email": "New@Example.com", "phone": "+254700000000",
+            "password": "Str0ng-pass!", "confirm_password": "Str0ng-pass!", "business_name": "Jane's Shop",
+            "business_type": "individual", "business_category": "electronics", "business_location": "Nairobi",
+        }
+        response = self.client.post(reverse("auth:register_seller"), payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+        self.assertFalse(SellerProfile.objects.exists())
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .bulk import bulk_set_status
+from .models import Listing
+from .test_queries import make_seller, make_buyer, fresh_user, make_listings
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class BulkListingStatusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.mine = make_listings(self.seller, 3, images_per_listing=0)
+        self.theirs = make_listings(make_seller("other@example.com"), 2, images_per_listing=0)
+        self.client.force_authenticate(fresh_user(self.seller))
+        self.url = reverse("auth:bulk_update_listing_status")
+
+    def statuses(self, listings):
+        return list(Listing.objects.filter(pk__in=[listing.pk for listing in listings]).values_list("status", flat=True))
+
+    def test_ids_are_ownership_checked(self):
+        ids = [self.mine[0].id, self.mine[1].id, self.theirs[0].id]
+        response = self.client.post(self.url, {"status": "inactive", "ids": ids}, format="json")
+        self.assertEqual(response.json(), {"matched": 2, "updated": 2, "not_found": [self.theirs[0].id]})
+        self.assertEqual(self.statuses(self.mine), ["active", "inactive", "inactive"])
+        self.assertEqual(self.statuses(self.theirs), ["active", "active"])
+
+    def test_filter_selects_own_listings(self):
+        Listing.objects.filter(pk=self.mine[0].pk).update(category="home")
+        payload = {"status": "deleted", "filter": {"category": "electronics"}}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(self.statuses(self.mine), ["deleted", "deleted", "active"])
+
+    def test_admin_can_change_any_listing(self):
+        admin = make_buyer("admin@example.com").user
+        admin.role = "admin"
+        admin.save()
+        self.client.force_authenticate(admin)
+        response = self.client.post(self.url, {"status": "inactive", "filter": {"status": "active"}}, format="json")
+        self.assertEqual(response.json()["updated"], 5)
+
+    def test_empty_filter_is_rejected(self):
+        response = self.client.post(self.url, {"status": "inactive", "filter": {}}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("filter", response.json())
+        self.assertEqual(self.statuses(self.mine), ["active", "active", "active"])
+
+    def test_ids_or_filter_required(self):
+        response = self.client.post(self.url, {"status": "inactive"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_buyers_are_rejected(self):
+        self.client.force_authenticate(fresh_user(make_buyer()))
+        response = self.client.post(self.url, {"status": "inactive", "ids": [1]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_feed_invalidated_once_per_chunk(self):
+        feed = reverse("auth:list_active_listings")
+        self.assertEqual(len(self.client.get(feed).json()["results"]), 5)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            updated = bulk_set_status(Listing.objects.filter(seller=self.seller), "inactive", chunk_size=2)
+        self.assertEqual((updated, len(callbacks)), (3, 2))
+        self.assertEqual(len(self.client.get(feed).json()["results"]), 2)
@@ -0,0 +1,96 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .facets import rebuild_facet_counts, precomputed_counts, live_counts, PRECOMPUTED_FACETS
+from .models import Listing
+from .test_queries import make_seller, make_listings
+
+
+def counts(facet):
+    return {entry["value"]: entry["count"] for entry in facet}
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        seller = make_seller()
+        phone, shirt, tractor, _ = make_listings(seller, 4, images_per_listing=0)
+        Listing.objects.filter(pk=shirt.pk).update(category="fashion", condition="new", area="Westlands")
+        Listing.objects.filter(pk=tractor.pk).update(category="agriculture", location="Nakuru", area="Town")
+        inactive = make_listings(seller, 1, images_per_listing=0)[0]
+        inactive.deactivate()
+
+    def fetch(self, **params):
+        response = self.client.get(reverse("auth:listing_facets"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_unfiltered_counts(self):
+        data = self.fetch()
+        self.assertEqual(
+            counts(data["category"]),
+            {"electronics": 2, "fashion": 1, "home": 0, "vehicles": 0, "services": 0, "agriculture": 1},
+        )
+        self.assertEqual(counts(data["condition"])["used"], 3)
+        self.assertEqual(data["location"], [{"value": "Nairobi", "count": 3}, {"value": "Nakuru", "count": 1}])
+        self.assertNotIn("area", data)
+
+    def test_each_facet_ignores_its_own_filter(self):
+        data = self.fetch(category="fashion", location="Nairobi")
+        # Category counts apply the location filter only.
+        self.assertEqual(counts(data["category"])["electronics"], 2)
+        self.assertEqual(counts(data["category"])["agriculture"], 0)
+        # Location counts apply the category filter only.
+        self.assertEqual(data["location"], [{"value": "Nairobi", "count": 1}])
+        self.assertEqual(data["area"], [{"value": "Westlands", "count": 1}])
+
+    def test_invalid_filters(self):
+        response = self.client.get(reverse("auth:listing_facets"), {"category": "boats"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_budget(self):
+        with self.assertNumQueries(3):
+            self.fetch(condition="used")
+        with self.assertNumQueries(0):
+            self.fetch(condition="used")
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], LISTING_FACETS_PRECOMPUTED=True)
+class PrecomputedListingFacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = make_seller()
+        self.listings = make_listings(self.seller, 3, images_per_listing=0)
+
+    def assertMatchesLive(self):
+        expected = {facet: live_counts(facet, {}) for facet in PRECOMPUTED_FACETS}
+        self.assertEqual(precomputed_counts(), expected)
+
+    def test_counts_follow_listing_writes(self):
+        self.assertMatchesLive()
+
+        self.listings[0].deactivate()
+        self.assertMatchesLive()
+
+        self.listings[1].category = "vehicles"
+        self.listings[1].location = "Kisumu"
+        self.listings[1].save()
+        self.assertMatchesLive()
+
+        self.listings[0].activate()
+        self.listings[2].delete()
+        self.assertMatchesLive()
+
+    def test_unfiltered_request_reads_the_table(self):
+        with self.assertNumQueries(1):
+            data = APIClient().get(reverse("auth:listing_facets")).json()
+        self.assertEqual(counts(data["category"])["electronics"], 3)
+
+    def test_rebuild_repairs_bulk_updates(self):
+        Listing.objects.filter(pk=self.listings[0].pk).update(status="inactive")
+        rebuild_facet_counts()
+        self.assertMatchesLive()
@@ -0,0 +1,95 @@
+import json
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .imports import read_rows, import_listings
+from .models import Listing
+from .test_queries import make_seller, make_buyer, fresh_user
+
+CSV_HEADER = "title,description,price,category,condition,location,area\n"
+
+
+def csv_file(*lines, name="items.csv"):
+    return SimpleUploadedFile(name, (CSV_HEADER + "".join(lines)).encode(), content_type="text/csv")
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class BulkImportEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.client.force_authenticate(fresh_user(self.seller))
+        self.url = reverse("auth:bulk_import_listings")
+
+    def test_valid_rows_are_imported_and_bad_rows_reported(self):
+        upload = csv_file(
+            "Phone,Brand new,15000,electronics,new,Nairobi,CBD\n",
+            "Boat,Wooden,abc,boats,used,Mombasa,Likoni\n",
+            "Maize,Per bag,,agriculture,fresh,Nakuru,Town\n",
+        )
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 1))
+        self.assertEqual(report["errors"][0]["row"], 3)
+        self.assertEqual(set(report["errors"][0]["errors"]), {"price", "category"})
+        self.assertEqual(
+            list(Listing.objects.filter(seller=self.seller).order_by("id").values_list("title", "price")),
+            [("Phone", 15000), ("Maize", None)],
+        )
+
+    @override_settings(LISTING_IMPORT_MAX_ROWS=1)
+    def test_row_limit(self):
+        upload = csv_file("A,a,1,home,new,Nairobi,CBD\n", "B,b,2,home,new,Nairobi,CBD\n")
+        report = self.client.post(self.url, {"file": upload}, format="multipart").json()
+        self.assertEqual(report["created"], 1)
+        self.assertIn("Row limit", report["errors"][0]["errors"])
+
+    def test_unknown_format(self):
+        upload = SimpleUploadedFile("items.xlsx", b"...")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+    def test_sellers_only(self):
+        self.client.force_authenticate(fresh_user(make_buyer()))
+        response = self.client.post(self.url, {"file": csv_file()}, format="multipart")
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportListingsTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+
+    def jsonl(self, count):
+        row = {"title": "Item", "description": "Good", "price": "10.00", "category": "home",
+               "condition": "used", "location": "Nairobi", "area": "CBD"}
+        return BytesIO("".join(json.dumps(row) + "\n" for _ in range(count)).encode())
+
+    def test_one_insert_per_chunk(self):
+        # Savepoint, INSERT, release per chunk of two.
+        with self.assertNumQueries(9):
+            result = import_listings(self.seller, read_rows(self.jsonl(5), "jsonl"), chunk_size=2)
+        self.assertEqual((result.created, result.failed), (5, 0))
+
+    def test_unparseable_lines(self):
+        stream = BytesIO(b'{"title": \n[1, 2]\n\n')
+        result = import_listings(self.seller, read_rows(stream, "jsonl"))
+        self.assertEqual(result.errors, [
+            {"row": 1, "errors": "Invalid JSON."},
+            {"row": 2, "errors": "Each line must be a JSON object."},
+        ])
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".jsonl") as handle:
+            handle.write(self.jsonl(3).getvalue())
+            handle.flush()
+            out = StringIO()
+            call_command("import_listings", handle.name, seller=self.seller.user.email.upper(), stdout=out)
+        self.assertIn("Imported 3 listing(s)", out.getvalue())
+        self.assertEqual(Listing.objects.filter(seller=self.seller).count(), 3)
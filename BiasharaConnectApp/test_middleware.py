@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.checks import Tags, run_checks
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .test_queries import make_seller, make_listings
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class PathRoutedMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # A browser that has been to the admin sends its session cookie everywhere.
+        session = SessionStore()
+        session.create()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+    def session_queries(self, method, path, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, **kwargs)
+        return response, [query["sql"] for query in queries if "django_session" in query["sql"]]
+
+    def test_anonymous_api_request_makes_no_session_queries(self):
+        make_listings(make_seller(), 2)
+        response, queries = self.session_queries("get", reverse("auth:list_active_listings"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_api_posts_need_no_csrf_token(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        response = client.post(reverse("auth:login"), {"email": "a@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_admin_keeps_the_session_stack(self):
+        response, queries = self.session_queries("get", "/admin/login/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+
+    def test_admin_still_enforces_csrf(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        response = client.post("/admin/login/", {"username": "a@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 403)
+
+
+class SiteMiddlewareCheckTests(SimpleTestCase):
+    def deploy_check_ids(self):
+        return [message.id for message in run_checks(include_deployment_checks=True, tags=[Tags.security])]
+
+    def test_configured_site_stack_passes(self):
+        ids = self.deploy_check_ids()
+        self.assertNotIn("BiasharaConnectApp.W001", ids)
+        self.assertNotIn("BiasharaConnectApp.W002", ids)
+
+    def test_missing_csrf_and_clickjacking_middleware_are_reported(self):
+        site_middleware = [
+            path for path in settings.SITE_MIDDLEWARE
+            if path not in ("django.middleware.csrf.CsrfViewMiddleware",
+                            "django.middleware.clickjacking.XFrameOptionsMiddleware")
+        ]
+        with override_settings(SITE_MIDDLEWARE=site_middleware):
+            ids = self.deploy_check_ids()
+        self.assertIn("BiasharaConnectApp.W001", ids)
+        self.assertIn("BiasharaConnectApp.W002", ids)
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import QueryDict
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cache import listings_page_key
+from .models import Listing, ListingImage, SavedListing, ImageUploadJob, ArchivedListing
+from .test_queries import make_seller, make_buyer, fresh_user, make_listings
+
+
+class ListingPrimaryImageTests(TestCase):
+    def setUp(self):
+        self.listing = make_listings(make_seller(), 1, images_per_listing=3)[0]
+        self.first, self.second, self.third = self.listing.images.order_by("id")
+
+    def primary_image(self):
+        return str(Listing.objects.get(pk=self.listing.pk).primary_image)
+
+    def test_primary_image_is_denormalized_on_create(self):
+        self.assertEqual(self.primary_image(), str(self.first.image))
+
+    def test_flagging_another_image_moves_the_primary(self):
+        self.third.is_primary = True
+        self.third.save()
+        self.assertEqual(list(self.listing.images.filter(is_primary=True)), [self.third])
+        self.assertEqual(self.primary_image(), str(self.third.image))
+
+    def test_deleting_the_primary_promotes_the_oldest_remaining_image(self):
+        self.first.delete()
+        self.second.refresh_from_db()
+        self.assertTrue(self.second.is_primary)
+        self.assertEqual(self.primary_image(), str(self.second.image))
+
+    def test_deleting_the_last_image_clears_the_column(self):
+        for image in self.listing.images.all():
+            image.delete()
+        self.assertIsNone(Listing.objects.get(pk=self.listing.pk).primary_image)
+
+    def test_database_allows_one_primary_per_listing(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ListingImage.objects.filter(pk=self.second.pk).update(is_primary=True)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingSaveCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.listing = make_listings(make_seller(), 1, images_per_listing=0)[0]
+        self.buyer = make_buyer()
+        self.client.force_authenticate(fresh_user(self.buyer))
+
+    def save_count(self):
+        return Listing.objects.values_list("save_count", flat=True).get(pk=self.listing.pk)
+
+    def test_toggle_increments_and_decrements(self):
+        url = reverse("auth:toggle_save_listing", args=[self.listing.id])
+        self.client.post(url)
+        self.assertEqual(self.save_count(), 1)
+        self.client.post(url)
+        self.assertEqual(self.save_count(), 0)
+
+    def test_concurrent_unsave_decrements_once(self):
+        url = reverse("auth:toggle_save_listing", args=[self.listing.id])
+        self.client.post(url)
+        SavedListing.objects.create(buyer=make_buyer("other-buyer@example.com"), listing=self.listing)
+        Listing.objects.filter(pk=self.listing.pk).update(save_count=2)
+
+        get_or_create = SavedListing.objects.get_or_create
+
+        def racing_unsave(**kwargs):
+            # Another request unsaves between this one's lookup and its delete.
+            saved, created = get_or_create(**kwargs)
+            SavedListing.objects.filter(pk=saved.pk).delete()
+            Listing.objects.filter(pk=self.listing.pk).update(save_count=F("save_count") - 1)
+            return saved, created
+
+        with mock.patch.object(SavedListing.objects, "get_or_create", side_effect=racing_unsave):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.save_count(), 1)
+        self.assertEqual(SavedListing.objects.filter(listing=self.listing).count(), 1)
+
+    def test_toggle_moves_the_feed_validators(self):
+        feed = reverse("auth:list_active_listings")
+        Listing.objects.filter(pk=self.listing.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+        etag = self.client.get(feed)["ETag"]
+        # Drop the cached page only: a flushed listings version would change the ETag by itself.
+        cache.delete(listings_page_key(QueryDict()))
+        self.client.post(reverse("auth:toggle_save_listing", args=[self.listing.id]))
+        self.assertGreater(Listing.objects.get(pk=self.listing.pk).updated_at, timezone.now() - timedelta(minutes=1))
+        response = self.client.get(feed, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["save_count"], 1)
+
+    def test_reconcile_fixes_drift(self):
+        other = make_listings(self.listing.seller, 1, images_per_listing=0)[0]
+        SavedListing.objects.create(buyer=self.buyer, listing=self.listing)
+        Listing.objects.filter(pk=other.pk).update(save_count=7)
+
+        out = StringIO()
+        call_command("reconcile_save_counts", stdout=out)
+        self.assertIn("2 listing(s)", out.getvalue())
+        self.assertEqual(self.save_count(), 1)
+        self.assertEqual(Listing.objects.get(pk=other.pk).save_count, 0)
+
+
+class ArchiveDeletedListingsTests(TestCase):
+    def setUp(self):
+        seller = make_seller()
+        self.old, self.recent, self.active = make_listings(seller, 3, images_per_listing=2)
+        SavedListing.objects.create(buyer=make_buyer(), listing=self.old)
+        self.full_image_id = self.old.images.order_by("id").first().pk
+        ListingImage.objects.filter(pk=self.full_image_id).update(
+            image="image/upload/v1/full.webp", image_card="image/upload/v1/card.webp",
+            image_thumb="image/upload/v1/thumb.webp",
+        )
+        self.pending = ListingImage.objects.create(listing=self.old, upload_status="pending")
+        ImageUploadJob.objects.create(listing_image=self.pending, folder="listings", file_name="a.jpg")
+        self.old.soft_delete()
+        self.recent.soft_delete()
+        Listing.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(days=120))
+
+    def test_archives_old_deleted_listings_with_children(self):
+        out = StringIO()
+        call_command("archive_deleted_listings", days=90, batch_size=1, stdout=out)
+        self.assertIn("Archived 1 listing(s)", out.getvalue())
+
+        self.assertEqual(set(Listing.objects.values_list("id", flat=True)), {self.recent.id, self.active.id})
+        self.assertFalse(ListingImage.objects.filter(listing_id=self.old.id).exists())
+        self.assertFalse(SavedListing.objects.filter(listing_id=self.old.id).exists())
+        self.assertFalse(ImageUploadJob.objects.exists())
+
+        archived = ArchivedListing.objects.get(pk=self.old.id)
+        self.assertEqual((archived.title, archived.status), (self.old.title, "deleted"))
+        self.assertEqual(archived.images.count(), 3)
+        full = archived.images.get(pk=self.full_image_id)
+        self.assertEqual(
+            (str(full.image), str(full.image_card), str(full.image_thumb)), ("full", "card", "thumb")
+        )
+        pending = archived.images.get(pk=self.pending.pk)
+        self.assertEqual((pending.image, pending.upload_status), (None, "pending"))
+        self.assertEqual(archived.saved_by.count(), 1)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command("archive_deleted_listings", days=90, dry_run=True, stdout=out)
+        self.assertIn("1 listing(s) would be archived", out.getvalue())
+        self.assertEqual(Listing.objects.count(), 3)
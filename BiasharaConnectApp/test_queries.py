@@ -0,0 +1,384 @@
+"""
+Query budgets per endpoint.
+
+Each test pins the number of SQL statements an endpoint may issue, and the
+list endpoints are exercised with several page sizes so an N+1 introduced by a
+serializer change fails here instead of in production.
+"""
+import base64
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .cache import listings_page_key
+from .models import User, BuyerProfile, SellerProfile, Listing, ListingImage
+from .pagination import KeysetPagination
+from .serializers import ListingCardSerializer
+
+
+def make_seller(email="seller@example.com"):
+    user = User.objects.create_user(
+        email=email, password="Str0ng-pass!", first_name="Jane", last_name="Wanjiru",
+        phone="+254700000000", role="seller",
+    )
+    return SellerProfile.objects.create(
+        user=user, business_name="Jane's Shop", business_type="individual",
+        business_category="electronics", business_location="Nairobi",
+    )
+
+
+def make_buyer(email="buyer@example.com"):
+    user = User.objects.create_user(
+        email=email, password="Str0ng-pass!", first_name="John", last_name="Otieno",
+        phone="+254700000001", role="buyer",
+    )
+    return BuyerProfile.objects.create(user=user, location="Mombasa")
+
+
+def fresh_user(profile):
+    """Reload the profile's user so no related objects are cached on it, as in a real request."""
+    return User.objects.get(pk=profile.user_id)
+
+
+def make_listings(seller, count, images_per_listing=2):
+    listings = []
+    for index in range(count):
+        listing = Listing.objects.create(
+            seller=seller, title=f"Item {index}", description="Good condition",
+            price=1000 + index, category="electronics", condition="used",
+            location="Nairobi", area="CBD",
+        )
+        for image_index in range(images_per_listing):
+            ListingImage.objects.create(
+                listing=listing,
+                image=f"BiasharaConnect/listing/item_{index}_{image_index}",
+                is_primary=(image_index == 0),
+            )
+        listings.append(listing)
+    return listings
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFeedQueryBudgetTests(TestCase):
+    # One aggregate for the ETag / Last-Modified validators, one joined SELECT
+    # for listings + seller + user, one prefetch for images.
+    FEED_QUERIES = 3
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = make_seller()
+
+    def assertFeedBudget(self, listing_count):
+        with self.assertNumQueries(self.FEED_QUERIES):
+            response = self.client.get(reverse("auth:list_active_listings"), {"limit": 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), listing_count)
+
+    def test_feed_query_count_is_constant(self):
+        for total in (1, 5, 25):
+            # Run the commit hooks so the cache version moves and the next request misses.
+            with self.captureOnCommitCallbacks(execute=True):
+                make_listings(self.seller, total - Listing.objects.count())
+            self.assertFeedBudget(total)
+
+    def test_card_view_selects_only_card_columns(self):
+        make_listings(self.seller, 10)
+        # The primary image is denormalized onto Listing: no image query at all.
+        with self.assertNumQueries(2) as queries:
+            response = self.client.get(reverse("auth:list_active_listings"), {"view": "card"})
+        self.assertNotIn('"description"', queries.captured_queries[1]["sql"])
+        self.assertNotIn("listingimage", queries.captured_queries[1]["sql"])
+        row = response.json()["results"][0]
+        self.assertEqual(set(row), set(ListingCardSerializer.Meta.fields))
+        self.assertEqual(row["primary_image"], "BiasharaConnect/listing/item_9_0")
+
+    def test_sparse_fieldset_skips_unrequested_relations(self):
+        make_listings(self.seller, 10)
+        # No seller join and no image prefetch: the validators aggregate plus one SELECT.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("auth:list_active_listings"), {"fields": "id,title,price"})
+        self.assertEqual(set(response.json()["results"][0]), {"id", "title", "price"})
+
+    def test_feed_next_page_has_same_budget(self):
+        make_listings(self.seller, 15)
+        first = self.client.get(reverse("auth:list_active_listings"), {"limit": 10}).json()
+        with self.assertNumQueries(self.FEED_QUERIES):
+            response = self.client.get(
+                reverse("auth:list_active_listings"), {"limit": 10, "cursor": first["next"]}
+            )
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_malformed_cursors_are_rejected(self):
+        for values in ([None, 1], [{}, 1], ["not a date", 1], ["2026-01-01T00:00:00+00:00", [1]]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = self.client.get(reverse("auth:list_active_listings"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, values)
+            self.assertEqual(response.json(), {"cursor": "Invalid cursor."})
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFeedPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.listings = make_listings(make_seller(), 5, images_per_listing=0)
+        self.url = reverse("auth:list_active_listings")
+
+    def test_pages_cover_every_listing_once(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            body = self.client.get(self.url, {"limit": 2, **({"cursor": cursor} if cursor else {})}).json()
+            self.assertLessEqual(len(body["results"]), 2)
+            ids += [row["id"] for row in body["results"]]
+            pages += 1
+            cursor = body["next"]
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(ids, sorted((listing.id for listing in self.listings), reverse=True))
+
+    def test_limit_is_capped(self):
+        with mock.patch.object(KeysetPagination, "max_limit", 3):
+            body = self.client.get(self.url, {"limit": 1000}).json()
+        self.assertEqual(len(body["results"]), 3)
+        self.assertIsNotNone(body["next"])
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"cursor": "Invalid cursor."})
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFeedSortTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.listings = make_listings(make_seller(), 4, images_per_listing=0)
+        Listing.objects.filter(pk__in=[self.listings[1].pk, self.listings[3].pk]).update(price=None)
+
+    def ids(self, **params):
+        return [row["id"] for row in self.client.get(reverse("auth:list_active_listings"), params).json()["results"]]
+
+    def walk(self, **params):
+        ids, cursor = [], None
+        while True:
+            body = self.client.get(
+                reverse("auth:list_active_listings"), {**params, "limit": 1, **({"cursor": cursor} if cursor else {})}
+            ).json()
+            ids += [row["id"] for row in body["results"]]
+            cursor = body["next"]
+            if not cursor:
+                return ids
+
+    def test_price_sorts_list_unpriced_listings_last(self):
+        first, unpriced, last, other_unpriced = (listing.id for listing in self.listings)
+        self.assertEqual(self.ids(sort="price_asc"), [first, last, unpriced, other_unpriced])
+        self.assertEqual(self.ids(sort="price_desc"), [last, first, other_unpriced, unpriced])
+
+    def test_price_sorts_page_through_the_unpriced_tail(self):
+        for sort in ("price_asc", "price_desc"):
+            self.assertEqual(self.walk(sort=sort), self.ids(sort=sort))
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFeedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.listing = make_listings(make_seller(), 1)[0]
+        self.url = reverse("auth:list_active_listings")
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.client.get(self.url, {"limit": 5, "category": "electronics"})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"category": "electronics", "limit": 5})
+        self.assertEqual(first.json(), second.json())
+
+    def test_listing_write_invalidates_cached_pages(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.listing.deactivate()
+        self.assertEqual(self.client.get(self.url).json()["results"], [])
+
+    def test_image_write_invalidates_cached_pages(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.listing.images.filter(is_primary=False).delete()
+        self.assertEqual(len(self.client.get(self.url).json()["results"][0]["images"]), 1)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingFeedConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.listing = make_listings(make_seller(), 1)[0]
+        self.url = reverse("auth:list_active_listings")
+
+    def test_matching_etag_returns_304_after_only_the_aggregate(self):
+        etag = self.client.get(self.url)["ETag"]
+        cache.delete(listings_page_key(QueryDict()))
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_matching_etag_on_cached_page_needs_no_queries(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_the_seller_is_renamed(self):
+        etag = self.client.get(self.url)["ETag"]
+        user = self.listing.seller.user
+        user.first_name = "Janet"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["seller_name"], "Janet Wanjiru")
+
+    def test_etag_changes_when_listing_leaves_the_feed(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.listing.deactivate()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class ListingDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.listing = make_listings(self.seller, 1, images_per_listing=3)[0]
+        self.url = reverse("auth:listing_detail", args=[self.listing.id])
+
+    def test_detail_budget_then_cached(self):
+        # Listing + seller + user in one SELECT, images in one prefetch.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()["id"], self.listing.id)
+        self.assertEqual(len(response.json()["images"]), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), response.json())
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_inactive_listing_is_not_found(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.listing.deactivate()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_image_change_invalidates_entry(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.listing.images.first().delete()
+        self.assertEqual(len(self.client.get(self.url).json()["images"]), 2)
+
+    def test_seller_change_invalidates_entry(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.is_verified = True
+            self.seller.save()
+        self.assertTrue(self.client.get(self.url).json()["seller_verified"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = self.seller.user
+            user.first_name = "Janet"
+            user.save()
+        self.assertEqual(self.client.get(self.url).json()["seller_name"], "Janet Wanjiru")
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class SellerListingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.listings = make_listings(self.seller, 3)
+        self.listings[0].deactivate()
+        make_listings(make_seller("other@example.com"), 2)
+        self.url = reverse("auth:seller_storefront", args=[self.seller.id])
+
+    def test_storefront_budget_then_cached(self):
+        # Seller header, then listings + seller + user in one SELECT and images in one prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        data = response.json()
+        self.assertEqual(data["seller"]["business_name"], "Jane's Shop")
+        self.assertEqual([item["id"] for item in data["results"]], [self.listings[2].id, self.listings[1].id])
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_storefront_header_invalidated_on_profile_change(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.is_verified = True
+            self.seller.save()
+        self.assertTrue(self.client.get(self.url).json()["seller"]["is_verified"])
+
+    def test_unknown_seller(self):
+        response = self.client.get(reverse("auth:seller_storefront", args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_my_listings_covers_every_status(self):
+        self.client.force_authenticate(fresh_user(self.seller))
+        url = reverse("auth:my_listings")
+        ids = [item["id"] for item in self.client.get(url).json()["results"]]
+        self.assertEqual(ids, [listing.id for listing in reversed(self.listings)])
+
+        response = self.client.get(url, {"status": "inactive", "view": "card"})
+        self.assertEqual([item["id"] for item in response.json()["results"]], [self.listings[0].id])
+
+    def test_my_listings_is_for_sellers_only(self):
+        self.client.force_authenticate(fresh_user(make_buyer()))
+        self.assertEqual(self.client.get(reverse("auth:my_listings")).status_code, 403)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class WriteEndpointQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.buyer = make_buyer()
+
+    def test_create_listing_without_images(self):
+        self.client.force_authenticate(fresh_user(self.seller))
+        payload = {
+            "title": "Phone", "description": "Brand new", "price": "15000.00",
+            "category": "electronics", "condition": "new", "location": "Nairobi", "area": "CBD",
+        }
+        # Seller profile lookup + listing INSERT, in one transaction (savepoint + release here).
+        with self.assertNumQueries(4):
+            response = self.client.post(reverse("auth:create_listing"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_toggle_save_listing(self):
+        listing = make_listings(self.seller, 1, images_per_listing=0)[0]
+        self.client.force_authenticate(fresh_user(self.buyer))
+        url = reverse("auth:toggle_save_listing", args=[listing.id])
+        # Listing lookup, then inside the atomic block: buyer profile lookup,
+        # get_or_create (SELECT, savepoint, INSERT, release) and the save_count UPDATE.
+        with self.assertNumQueries(9):
+            response = self.client.post(url)
+        self.assertEqual(response.json(), {"message": "Listing saved"})
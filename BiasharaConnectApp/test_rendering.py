@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import Listing
+from .renderers import ORJSONRenderer
+from .test_queries import make_seller, make_listings
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class FastListingRowsTests(TestCase):
+    """The values() fast path must render exactly what ListingSerializer renders."""
+
+    def setUp(self):
+        self.client = APIClient()
+        seller = make_seller()
+        seller.is_verified = True
+        seller.profile_image = "BiasharaConnect/profile_image/jane"
+        seller.save()
+        listings = make_listings(seller, 4)
+        Listing.objects.filter(pk=listings[0].pk).update(price=None)
+        Listing.objects.filter(pk=listings[1].pk).update(price=Decimal("12.5"))
+        Listing.objects.filter(pk=listings[2].pk).update(title="Simu ya Tecno   – 📱", description="Bei nafuu")
+
+    def fetch(self, fast, **params):
+        cache.clear()
+        with self.settings(LISTINGS_FAST_SERIALIZATION=fast):
+            response = self.client.get(reverse("auth:list_active_listings"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assertSameBytes(self, **params):
+        self.assertEqual(self.fetch(True, **params), self.fetch(False, **params))
+
+    def test_full_view(self):
+        self.assertSameBytes()
+
+    def test_card_view(self):
+        self.assertSameBytes(view="card")
+
+    def test_sparse_fieldsets(self):
+        self.assertSameBytes(fields="title,id,images,seller_name")
+        self.assertSameBytes(view="card", fields="primary_image,price")
+
+    def test_paginated_price_sort(self):
+        self.assertSameBytes(sort="price_asc", limit=2)
+
+    def test_orjson_renderer_matches_stdlib_renderer(self):
+        data = {"results": [{"title": "Café    ", "price": "10.00", "ok": True, "n": None}]}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,64 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import Listing
+from .test_queries import make_seller, make_listings
+
+
+# These tests exercise the database search index, so keep the response cache out of the way.
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+)
+class ListingSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.first, self.second, self.third = make_listings(self.seller, 3, images_per_listing=0)
+
+    def search(self, query, **params):
+        response = self.client.get(reverse("auth:list_active_listings"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self.assertEqual(self.search("tractor"), [])
+
+        self.first.title = "Tractor for hire"
+        self.first.save()
+        Listing.objects.filter(pk=self.second.pk).update(description="Tractor spares")
+        self.assertCountEqual(self.search("tractor"), [self.first.id, self.second.id])
+
+        self.second.delete()
+        self.assertEqual(self.search("tractor"), [self.first.id])
+
+    def test_title_matches_rank_first(self):
+        Listing.objects.filter(pk=self.first.pk).update(description="Fits any laptop")
+        Listing.objects.filter(pk=self.second.pk).update(title="Laptop bag")
+        self.assertEqual(self.search("laptop"), [self.second.id, self.first.id])
+
+    def test_search_combines_with_filters(self):
+        Listing.objects.update(title="Laptop")
+        Listing.objects.filter(pk=self.third.pk).update(category="fashion")
+        self.assertEqual(self.search("laptop", category="fashion"), [self.third.id])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('") OR title:*'), [])
+
+    def test_relevance_pages_walk_every_match_once(self):
+        Listing.objects.filter(pk=self.first.pk).update(title="Laptop", description="A laptop for work")
+        Listing.objects.filter(pk=self.second.pk).update(title="Laptop bag")
+        Listing.objects.filter(pk=self.third.pk).update(description="Bag that fits a laptop and charger")
+        expected = self.search("laptop", sort="relevance")
+
+        seen, cursor = [], None
+        while True:
+            params = {"q": "laptop", "sort": "relevance", "limit": 1, **({"cursor": cursor} if cursor else {})}
+            body = self.client.get(reverse("auth:list_active_listings"), params).json()
+            seen += [row["id"] for row in body["results"]]
+            cursor = body["next"]
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(expected), 3)
@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .test_queries import make_seller, fresh_user
+
+BUDGETS = {
+    "login": {"rate": "1/minute", "burst": 2},
+    "register": {"rate": "1/hour", "burst": 1},
+    "create_listing": {"rate": "1/minute", "burst": 1},
+}
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], THROTTLE_BUDGETS=BUDGETS)
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, ip="10.0.0.1"):
+        payload = {"email": "nobody@example.com", "password": "wrong"}
+        return self.client.post(reverse("auth:login"), payload, format="json", REMOTE_ADDR=ip)
+
+    @mock.patch("BiasharaConnectApp.throttling.time.time", return_value=1000.0)
+    def test_burst_is_allowed_then_refused_with_retry_after(self, time):
+        self.assertEqual([self.login().status_code for _ in range(2)], [401, 401])
+        # Refused before authenticate(): no user query, no password hash.
+        with self.assertNumQueries(0):
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+
+    def test_buckets_are_per_ip(self):
+        for _ in range(3):
+            self.login("10.0.0.1")
+        self.assertEqual(self.login("10.0.0.2").status_code, 401)
+
+    def test_spoofed_forwarded_for_does_not_get_a_fresh_bucket(self):
+        payload = {"email": "nobody@example.com", "password": "wrong"}
+        statuses = [
+            self.client.post(
+                reverse("auth:login"), payload, format="json",
+                REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"1.2.3.{index}",
+            ).status_code
+            for index in range(3)
+        ]
+        self.assertEqual(statuses, [401, 401, 429])
+
+    def test_behind_a_proxy_the_address_it_appended_is_used(self):
+        payload = {"email": "nobody@example.com", "password": "wrong"}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            statuses = [
+                self.client.post(
+                    reverse("auth:login"), payload, format="json",
+                    REMOTE_ADDR="10.0.0.254", HTTP_X_FORWARDED_FOR=f"1.2.3.{index}, 41.90.0.7",
+                ).status_code
+                for index in range(3)
+            ]
+        self.assertEqual(statuses, [401, 401, 429])
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch("BiasharaConnectApp.throttling.time.time", return_value=1000.0):
+            self.login()
+            self.login()
+            self.assertEqual(self.login().status_code, 429)
+        with mock.patch("BiasharaConnectApp.throttling.time.time", return_value=1030.0):
+            self.assertEqual(self.login()["Retry-After"], "30")
+        with mock.patch("BiasharaConnectApp.throttling.time.time", return_value=1060.0):
+            self.assertEqual(self.login().status_code, 401)
+
+    def test_registration_budget_is_shared_by_both_roles(self):
+        self.client.post(reverse("auth:register_buyer"), {}, format="json")
+        self.assertEqual(self.client.post(reverse("auth:register_seller"), {}, format="json").status_code, 429)
+
+    def test_authenticated_callers_get_their_own_bucket(self):
+        first, second = make_seller("first@example.com"), make_seller("second@example.com")
+        self.client.force_authenticate(fresh_user(first))
+        self.client.post(reverse("auth:create_listing"), {}, format="json")
+        self.assertEqual(self.client.post(reverse("auth:create_listing"), {}, format="json").status_code, 429)
+
+        self.client.force_authenticate(fresh_user(second))
+        self.assertEqual(self.client.post(reverse("auth:create_listing"), {}, format="json").status_code, 400)
+
+    @override_settings(THROTTLE_BUDGETS={})
+    def test_routes_without_a_budget_are_not_throttled(self):
+        self.assertEqual({self.login().status_code for _ in range(5)}, {401})
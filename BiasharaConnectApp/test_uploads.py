@@ -0,0 +1,321 @@
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .forms import ListingImageForm
+from .models import Listing, ListingImage, ImageUploadJob
+from .renditions import UnprocessableImage, render_renditions
+from .storage import ImageStorage, LocalImageStorage, get_staging_storage
+from .test_queries import make_seller, fresh_user
+from .upload_handlers import ImageUploadHandler, UploadRejected
+from .uploads import process_jobs, prune_failed_jobs, _finalize_or_clean_up
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class FailingStorage(ImageStorage):
+    def upload(self, file, folder):
+        raise ConnectionError("storage unavailable")
+
+    def delete(self, name):
+        pass
+
+
+class BarrierStorage(LocalImageStorage):
+    """Only succeeds if three uploads are in flight at the same time."""
+
+    barrier = None
+
+    def upload(self, file, folder):
+        self.barrier.wait(timeout=5)
+        return super().upload(file, folder)
+
+
+def image_file(name="photo.png", size=(4, 4)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    MEDIA_ROOT=MEDIA_ROOT,
+    IMAGE_STORAGE_BACKEND="BiasharaConnectApp.storage.LocalImageStorage",
+    IMAGE_UPLOADS_ASYNC=True,
+    IMAGE_UPLOAD_MAX_ATTEMPTS=2,
+)
+class ImageUploadQueueTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = make_seller()
+        self.client.force_authenticate(fresh_user(self.seller))
+
+    def create_listing(self, images=2):
+        payload = {
+            "title": "Phone", "description": "Brand new", "price": "15000.00",
+            "category": "electronics", "condition": "new", "location": "Nairobi", "area": "CBD",
+            "images": [image_file(f"photo{index}.png") for index in range(images)],
+        }
+        response = self.client.post(reverse("auth:create_listing"), payload, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        return Listing.objects.get(pk=response.json()["id"])
+
+    def upload_status(self, listing):
+        return self.client.get(reverse("auth:listing_upload_status", args=[listing.id])).json()
+
+    def test_listing_is_created_with_pending_images(self):
+        listing = self.create_listing()
+        status = self.upload_status(listing)
+        self.assertEqual(status["pending"], 2)
+        self.assertEqual([image["upload_status"] for image in status["images"]], ["pending", "pending"])
+        self.assertIsNone(listing.primary_image)
+
+        self.assertEqual(process_jobs(), (2, 0))
+        status = self.upload_status(listing)
+        self.assertEqual(status["pending"], 0)
+        self.assertTrue(all(image["image"].startswith("BiasharaConnect/listing/") for image in status["images"]))
+        listing.refresh_from_db()
+        primary = ListingImage.objects.get(listing=listing, is_primary=True)
+        self.assertEqual(str(listing.primary_image), str(primary.image_card))
+        self.assertFalse(ImageUploadJob.objects.exists())
+
+    @override_settings(IMAGE_STORAGE_BACKEND="BiasharaConnectApp.test_uploads.FailingStorage")
+    def test_failed_uploads_are_retried_then_marked_failed(self):
+        listing = self.create_listing(images=1)
+        self.assertEqual(process_jobs(), (0, 1))
+        job = ImageUploadJob.objects.get()
+        self.assertEqual((job.status, job.attempts), ("pending", 1))
+        self.assertGreater(job.available_at, timezone.now())
+        # Backing off: not due yet.
+        self.assertEqual(process_jobs(), (0, 0))
+
+        ImageUploadJob.objects.update(available_at=timezone.now())
+        self.assertEqual(process_jobs(), (0, 1))
+        image = self.upload_status(listing)["images"][0]
+        self.assertEqual(image["upload_status"], "failed")
+        self.assertEqual(image["attempts"], 2)
+        self.assertIn("storage unavailable", image["error"])
+
+    @override_settings(IMAGE_UPLOADS_ASYNC=False)
+    def test_synchronous_mode_uploads_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            listing = self.create_listing(images=1)
+        self.assertEqual(ListingImage.objects.get(listing=listing).upload_status, "ready")
+
+    def test_upload_status_is_private(self):
+        listing = self.create_listing(images=1)
+        self.client.force_authenticate(fresh_user(make_seller("other@example.com")))
+        response = self.client.get(reverse("auth:listing_upload_status", args=[listing.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_create_listing_queues_images_in_two_inserts(self):
+        payload = {
+            "title": "Phone", "description": "Brand new", "price": "15000.00",
+            "category": "electronics", "condition": "new", "location": "Nairobi", "area": "CBD",
+            "images": [image_file(f"photo{index}.png") for index in range(5)],
+        }
+        with self.assertNumQueries(6):
+            self.client.post(reverse("auth:create_listing"), payload, format="multipart")
+        self.assertEqual(ImageUploadJob.objects.count(), 5)
+        self.assertEqual(list(ListingImage.objects.values_list("is_primary", flat=True)), [True] + [False] * 4)
+
+    @override_settings(
+        IMAGE_STORAGE_BACKEND="BiasharaConnectApp.test_uploads.BarrierStorage", IMAGE_UPLOAD_CONCURRENCY=3
+    )
+    def test_uploads_run_concurrently(self):
+        BarrierStorage.barrier = threading.Barrier(3)
+        self.create_listing(images=3)
+        self.assertEqual(process_jobs(), (3, 0))
+
+    def test_asset_is_removed_when_its_image_is_gone(self):
+        self.create_listing(images=1)
+        job = ImageUploadJob.objects.select_related("listing_image").get()
+        storage = LocalImageStorage()
+        stored = {
+            name: storage.upload(image_file(f"photo_{name}.png"), "BiasharaConnect/listing")
+            for name in ("thumb", "card", "full")
+        }
+        # The image (and its job) are deleted while the upload is in flight.
+        ListingImage.objects.filter(pk=job.listing_image_id).delete()
+        self.assertFalse(_finalize_or_clean_up(storage, job, stored))
+        self.assertFalse(any(storage.storage.exists(name) for name in stored.values()))
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_spooled_upload_is_staged_without_being_read_into_memory(self):
+        # Every file goes to a temp file; staging must move it, not read() it.
+        with mock.patch.object(TemporaryUploadedFile, "read", side_effect=AssertionError("read into memory")):
+            listing = self.create_listing(images=2)
+        staging = get_staging_storage()
+        jobs = ImageUploadJob.objects.filter(listing_image__listing=listing)
+        self.assertEqual(jobs.count(), 2)
+        self.assertTrue(all(staging.exists(job.staged_name) for job in jobs))
+
+        staged_names = [job.staged_name for job in jobs]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(process_jobs(), (2, 0))
+        self.assertFalse(any(staging.exists(name) for name in staged_names))
+
+    def test_failed_jobs_are_pruned_after_the_retention(self):
+        self.create_listing(images=1)
+        ImageUploadJob.objects.update(status="failed")
+        self.assertEqual(prune_failed_jobs(), 0)
+        with override_settings(IMAGE_UPLOAD_FAILED_RETENTION=7):
+            self.assertEqual(prune_failed_jobs(now=timezone.now() + timedelta(days=8)), 1)
+        self.assertFalse(ImageUploadJob.objects.exists())
+
+    def test_image_form_queues_the_upload_once_saved(self):
+        listing = Listing.objects.get(pk=self.create_listing(images=1).pk)
+        ImageUploadJob.objects.all().delete()
+        form = ListingImageForm(
+            data={"is_primary": False}, files={"upload_image": image_file()}, instance=ListingImage(listing=listing)
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        # The admin's order: save(commit=False), save the instance, then save_m2m().
+        image = form.save(commit=False)
+        self.assertFalse(ImageUploadJob.objects.exists())
+        image.save()
+        form.save_m2m()
+        self.assertEqual(ImageUploadJob.objects.get().listing_image, image)
+        self.assertEqual(image.upload_status, "pending")
+
+    def test_undecodable_upload_fails_without_retrying(self):
+        listing = self.create_listing(images=1)
+        job = ImageUploadJob.objects.get()
+        staging = get_staging_storage()
+        staging.delete(job.staged_name)
+        staging.save(job.staged_name, ContentFile(b"not an image"))
+        self.assertEqual(process_jobs(), (0, 1))
+        self.assertEqual(self.upload_status(listing)["images"][0]["upload_status"], "failed")
+
+
+@override_settings(IMAGE_RENDITIONS={"thumb": 20, "card": 50, "full": 100}, IMAGE_RENDITION_FORMAT="WEBP")
+class RenditionTests(TestCase):
+    def photo(self, size=(400, 200), orientation=None):
+        image = Image.new("RGB", size, "red")
+        exif = Image.Exif()
+        exif[0x010F] = "PhoneMaker"  # Make
+        if orientation:
+            exif[0x0112] = orientation
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", exif=exif.tobytes())
+        return buffer.getvalue()
+
+    def open(self, data):
+        return Image.open(BytesIO(data))
+
+    def test_sizes_are_capped_and_metadata_stripped(self):
+        renditions = render_renditions(self.photo())
+        self.assertEqual(
+            {name: self.open(data).size for name, (data, extension) in renditions.items()},
+            {"thumb": (20, 10), "card": (50, 25), "full": (100, 50)},
+        )
+        full = self.open(renditions["full"][0])
+        self.assertEqual((full.format, renditions["full"][1]), ("WEBP", "webp"))
+        self.assertEqual(dict(full.getexif()), {})
+
+    def test_exif_orientation_is_applied(self):
+        # Orientation 6: stored landscape, displayed rotated 90 degrees.
+        renditions = render_renditions(self.photo(orientation=6))
+        self.assertEqual(self.open(renditions["full"][0]).size, (50, 100))
+
+    def test_small_images_are_not_upscaled(self):
+        renditions = render_renditions(self.photo(size=(30, 30)))
+        self.assertEqual(self.open(renditions["full"][0]).size, (30, 30))
+
+    @override_settings(IMAGE_RENDITION_FORMAT="JPEG")
+    def test_transparent_images_are_flattened_for_jpeg(self):
+        buffer = BytesIO()
+        Image.new("RGBA", (10, 10), (0, 0, 0, 0)).save(buffer, format="PNG")
+        data, extension = render_renditions(buffer.getvalue())["full"]
+        self.assertEqual((self.open(data).mode, extension), ("RGB", "jpg"))
+
+    def test_undecodable_data(self):
+        with self.assertRaises(UnprocessableImage):
+            render_renditions(b"not an image")
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], MEDIA_ROOT=MEDIA_ROOT, IMAGE_UPLOADS_ASYNC=True)
+class UploadLimitTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(fresh_user(make_seller()))
+
+    def create_listing(self, images):
+        payload = {
+            "title": "Phone", "description": "Brand new", "price": "15000.00",
+            "category": "electronics", "condition": "new", "location": "Nairobi", "area": "CBD",
+            "images": images,
+        }
+        return self.client.post(reverse("auth:create_listing"), payload, format="multipart")
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(message, response.json()["detail"])
+        self.assertFalse(Listing.objects.exists())
+
+    def test_images_within_limits_are_accepted(self):
+        self.assertEqual(self.create_listing([image_file("a.png"), image_file("b.png")]).status_code, 201)
+
+    def test_non_image_payload_is_rejected(self):
+        fake = SimpleUploadedFile("photo.png", b"#!/bin/sh\necho hello\n", content_type="image/png")
+        self.assertRejected(self.create_listing([fake]), "photo.png: not a JPEG, PNG, GIF or WebP image")
+
+    def test_truncated_image_is_rejected(self):
+        data = image_file().read()[:20]
+        truncated = SimpleUploadedFile("photo.png", data, content_type="image/png")
+        self.assertRejected(self.create_listing([truncated]), "corrupt or truncated")
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=100)
+    def test_oversized_dimensions_are_rejected(self):
+        self.assertRejected(self.create_listing([image_file(size=(20, 10))]), "limited to 100 pixels")
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=50)
+    def test_oversized_file_is_rejected(self):
+        self.assertRejected(self.create_listing([image_file()]), "images are limited to 50")
+
+    @override_settings(IMAGE_UPLOAD_MAX_FILES=2)
+    def test_image_count_is_limited(self):
+        images = [image_file(f"photo{index}.png") for index in range(3)]
+        self.assertRejected(self.create_listing(images), "At most 2 images")
+
+    @override_settings(UPLOAD_MAX_REQUEST_SIZE=1024)
+    def test_request_size_is_checked_before_reading(self):
+        self.assertRejected(self.create_listing([image_file(size=(400, 400))]), "per request")
+
+    def test_rejection_stops_reading_the_body(self):
+        fake = SimpleUploadedFile("photo.png", b"x" * 1024 * 1024)
+        body = encode_multipart(BOUNDARY, {"images": [fake, image_file()]})
+        stream = BytesIO(body)
+        meta = {"CONTENT_TYPE": MULTIPART_CONTENT, "CONTENT_LENGTH": str(len(body))}
+        handlers = [ImageUploadHandler(), TemporaryFileUploadHandler()]
+        with self.assertRaises(UploadRejected):
+            MultiPartParser(meta, stream, handlers).parse()
+        # Rejected on the first chunk of the first file.
+        self.assertLess(stream.tell(), len(body) // 4)
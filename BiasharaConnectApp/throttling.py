@@ -0,0 +1,79 @@
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+Each throttle class names a scope whose budget is set in THROTTLE_BUDGETS:
+`rate` ("N/second|minute|hour|day") is how fast a bucket refills and `burst`
+how many tokens it holds. Callers get one bucket per scope, keyed by user
+when authenticated and by client IP otherwise.
+
+Buckets live in the THROTTLE_CACHE cache: per process with locmem, shared
+across nodes with Redis. The read-then-write on a bucket isn't atomic, so
+concurrent requests from one caller can occasionally both take the last token.
+
+DRF checks throttles before the view runs, so a refused request never
+reaches the database, a password hasher or the multipart parser; it gets a
+429 with Retry-After.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """Tokens per second for a rate such as "10/minute"."""
+    count, period = rate.split("/")
+    return int(count) / PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"throttle:{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        budget = settings.THROTTLE_BUDGETS.get(self.scope)
+        if not budget:
+            return True
+        rate = parse_rate(budget["rate"])
+        capacity = budget["burst"]
+
+        cache = caches[settings.THROTTLE_CACHE]
+        key = self.get_cache_key(request, view)
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens < 1:
+            self.retry_after = (1 - tokens) / rate
+            return False
+
+        # Once the bucket would be full again the entry carries no information.
+        cache.set(key, (tokens - 1, now), timeout=math.ceil(capacity / rate))
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoginThrottle(TokenBucketThrottle):
+    scope = "login"
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = "register"
+
+
+class CreateListingThrottle(TokenBucketThrottle):
+    scope = "create_listing"
@@ -0,0 +1,132 @@
+"""
+Upload handler that vets multipart files while they stream in.
+
+ImageUploadHandler sits ahead of Django's memory and temporary-file handlers
+(FILE_UPLOAD_HANDLERS) and passes every chunk through untouched, so files
+still land in memory or, above FILE_UPLOAD_MAX_MEMORY_SIZE, in a temp file.
+On the way it enforces, without waiting for the rest of the body:
+
+- UPLOAD_MAX_REQUEST_SIZE: checked against Content-Length before anything is
+  read, and again as file bytes arrive;
+- for image fields: IMAGE_UPLOAD_MAX_FILES per request, IMAGE_UPLOAD_MAX_SIZE
+  per file, and a JPEG / PNG / GIF / WebP signature of at most
+  IMAGE_UPLOAD_MAX_PIXELS, sniffed from the file's first bytes.
+
+A rejected upload raises UploadRejected (a MultiPartParserError, so DRF and
+Django both answer 400) and the remainder of the body is never read.
+"""
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
+
+# Multipart fields that carry images: the API's `images` and the admin forms'
+# fields (formset fields arrive prefixed, e.g. "images-0-upload_image").
+IMAGE_FIELDS = {"images", "upload_image", "upload_profile_image"}
+
+SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+)
+
+# Leading bytes buffered while looking for the dimensions; a JPEG's size can
+# sit behind up to 64 KB of EXIF.
+SNIFF_LIMIT = 256 * 1024
+
+
+class UploadRejected(MultiPartParserError):
+    pass
+
+
+def sniff_format(head):
+    """The image format `head` (a file's first 12+ bytes) starts with, or None."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    for signature, image_format in SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    return None
+
+
+def read_dimensions(head):
+    """`(width, height)` from an image's leading bytes, or None if they don't reach that far."""
+    try:
+        with Image.open(BytesIO(head)) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+class ImageUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.total_bytes = 0
+        self.image_count = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > settings.UPLOAD_MAX_REQUEST_SIZE:
+            raise UploadRejected(
+                f"Uploads are limited to {filesizeformat(settings.UPLOAD_MAX_REQUEST_SIZE)} per request."
+            )
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.is_image = field_name.rsplit("-", 1)[-1] in IMAGE_FIELDS
+        self.head = b""
+        self.dimensions = None
+        if self.is_image:
+            self.image_count += 1
+            if self.image_count > settings.IMAGE_UPLOAD_MAX_FILES:
+                raise UploadRejected(f"At most {settings.IMAGE_UPLOAD_MAX_FILES} images can be uploaded at once.")
+
+    def receive_data_chunk(self, raw_data, start):
+        self.total_bytes += len(raw_data)
+        if self.total_bytes > settings.UPLOAD_MAX_REQUEST_SIZE:
+            raise UploadRejected(
+                f"Uploads are limited to {filesizeformat(settings.UPLOAD_MAX_REQUEST_SIZE)} per request."
+            )
+        if self.is_image:
+            if start + len(raw_data) > settings.IMAGE_UPLOAD_MAX_SIZE:
+                raise UploadRejected(
+                    f"{self.file_name}: images are limited to {filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}."
+                )
+            if self.dimensions is None:
+                self._sniff(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # A file shorter than its header is only judged once it has all arrived.
+        if self.is_image and self.dimensions is None:
+            self._sniff(b"", complete=True)
+        return None
+
+    def _sniff(self, raw_data, complete=False):
+        self.head += raw_data
+        if len(self.head) < 12 and not complete:
+            return
+        if sniff_format(self.head) is None:
+            raise UploadRejected(f"{self.file_name}: not a JPEG, PNG, GIF or WebP image.")
+
+        try:
+            dimensions = read_dimensions(self.head)
+        except Image.DecompressionBombError:
+            # So large that Pillow refuses to open it at all.
+            raise UploadRejected(self._pixel_limit_message())
+        if dimensions is None:
+            if complete or len(self.head) >= SNIFF_LIMIT:
+                raise UploadRejected(f"{self.file_name}: the image is corrupt or truncated.")
+            return
+
+        width, height = dimensions
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            raise UploadRejected(self._pixel_limit_message())
+        self.dimensions = dimensions
+        self.head = b""
+
+    def _pixel_limit_message(self):
+        return f"{self.file_name}: images are limited to {settings.IMAGE_UPLOAD_MAX_PIXELS:,} pixels."
@@ -0,0 +1,219 @@
+"""
+Database-backed queue for image uploads.
+
+Requests stage each image in the staging storage (a temp-file upload is
+moved there, a small one streamed in chunks, neither read whole into memory),
+record it in an ImageUploadJob and return straight away; the listing image
+exists immediately with `upload_status='pending'`. Workers
+(`manage.py process_image_uploads`) claim due jobs, upload them through the
+configured storage backend (storage.py) and point the image at the result.
+Each photo is first normalized into thumb / card / full renditions
+(renditions.py); only those are stored, never the original upload.
+Failures are retried with exponential backoff up to IMAGE_UPLOAD_MAX_ATTEMPTS.
+A finished job is deleted along with its staged file; a failed one is kept, for the
+admin to retry, for IMAGE_UPLOAD_FAILED_RETENTION days.
+
+With IMAGE_UPLOADS_ASYNC off, a request's jobs run together as soon as its
+transaction commits, in the request that created them.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ListingImage, ImageUploadJob
+from .renditions import UnprocessableImage, render_renditions
+from .storage import get_image_storage, get_staging_storage
+
+LISTING_IMAGE_FOLDER = "BiasharaConnect/listing"
+PROFILE_IMAGE_FOLDER = "BiasharaConnect/profile_image"
+
+
+# =========================
+# Enqueueing
+# =========================
+def enqueue_listing_images(listing, files):
+    """
+    Create a pending image on a new `listing` for each of `files`, the first
+    one primary, and queue the uploads. Two INSERTs however many files.
+    """
+    # bulk_create skips ListingImage.save() and its signals: fine for a new
+    # listing, whose single primary is set here and which has nothing cached.
+    images = ListingImage.objects.bulk_create(
+        ListingImage(listing=listing, is_primary=(index == 0), upload_status="pending")
+        for index in range(len(files))
+    )
+    jobs = ImageUploadJob.objects.bulk_create(
+        _job(file, LISTING_IMAGE_FOLDER, listing_image=image) for image, file in zip(images, files)
+    )
+    _schedule(jobs)
+    return images
+
+
+def enqueue_profile_image(seller, file):
+    """Queue `file` as the seller's new profile image."""
+    return queue_upload(file, PROFILE_IMAGE_FOLDER, seller=seller)
+
+
+def queue_upload(file, folder, listing_image=None, seller=None):
+    job = _job(file, folder, listing_image=listing_image, seller=seller)
+    job.save()
+    _schedule([job])
+    return job
+
+
+def _job(file, folder, **target):
+    if hasattr(file, "seek"):
+        file.seek(0)
+    file_name = os.path.basename(file.name or "image")
+    staged_name = get_staging_storage().save(file_name, file)
+    return ImageUploadJob(folder=folder, file_name=file_name, staged_name=staged_name, **target)
+
+
+def delete_staged(names):
+    staging = get_staging_storage()
+    for name in names:
+        if name:
+            staging.delete(name)
+
+
+def _schedule(jobs):
+    if not settings.IMAGE_UPLOADS_ASYNC:
+        ids = [job.pk for job in jobs]
+        transaction.on_commit(lambda: process_jobs(limit=len(ids), ids=ids))
+
+
+# =========================
+# Workers
+# =========================
+def claim_jobs(limit, ids=None):
+    """
+    Mark up to `limit` due jobs as processing and return their ids. Jobs left
+    processing longer than IMAGE_UPLOAD_LOCK_TIMEOUT (a worker died) are due again.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_UPLOAD_LOCK_TIMEOUT)
+    due = ImageUploadJob.objects.filter(
+        Q(status="pending", available_at__lte=now) | Q(status="processing", locked_at__lt=stale)
+    )
+    if ids is not None:
+        due = due.filter(id__in=ids)
+
+    with transaction.atomic():
+        # SKIP LOCKED lets concurrent workers claim disjoint batches.
+        claimed = list(
+            due.order_by("available_at", "id").select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+        )
+        ImageUploadJob.objects.filter(id__in=claimed).update(status="processing", locked_at=now)
+    return claimed
+
+
+def process_jobs(limit=10, ids=None):
+    """
+    Claim and run up to `limit` jobs. Returns `(succeeded, failed)` counts.
+
+    The storage uploads run concurrently on up to IMAGE_UPLOAD_CONCURRENCY
+    threads, so a batch takes about as long as its slowest upload; the
+    database writes that follow stay on the calling thread.
+    """
+    # A job whose listing image was deleted while queued is gone with it.
+    jobs = list(ImageUploadJob.objects.select_related("listing_image", "seller").filter(pk__in=claim_jobs(limit, ids)))
+    if not jobs:
+        return 0, 0
+
+    storage = get_image_storage()
+    with ThreadPoolExecutor(max_workers=min(settings.IMAGE_UPLOAD_CONCURRENCY, len(jobs))) as pool:
+        outcomes = list(pool.map(lambda job: _upload(storage, job), jobs))
+
+    succeeded = failed = 0
+    for job, (stored, exc) in zip(jobs, outcomes):
+        if exc is None and _finalize_or_clean_up(storage, job, stored):
+            succeeded += 1
+        else:
+            if exc is not None:
+                record_failure(job, exc)
+            failed += 1
+    return succeeded, failed
+
+
+def _upload(storage, job):
+    """Render and store one job's renditions: `({name: stored_name}, None)` or `(None, exc)`."""
+    if job.listing_image is not None:
+        sizes = settings.IMAGE_RENDITIONS
+    else:
+        sizes = {"full": settings.IMAGE_RENDITIONS["card"]}
+    stored = {}
+    try:
+        stem = os.path.splitext(job.file_name)[0]
+        with get_staging_storage().open(job.staged_name) as staged:
+            renditions = render_renditions(staged, sizes)
+        for name, (data, extension) in renditions.items():
+            stored[name] = storage.upload(ContentFile(data, name=f"{stem}_{name}.{extension}"), job.folder)
+    except Exception as exc:
+        _delete_stored(storage, stored)
+        return None, exc
+    return stored, None
+
+
+def _finalize_or_clean_up(storage, job, stored):
+    try:
+        finalize(job, stored)
+    except DatabaseError as exc:
+        # The target went away mid-upload (or the write failed): the stored
+        # assets are referenced by nothing, so remove them again.
+        _delete_stored(storage, stored)
+        ImageUploadJob.objects.filter(pk=job.pk).update(
+            status="failed", last_error=f"{type(exc).__name__}: {exc}"[:1000], locked_at=None
+        )
+        return False
+    return True
+
+
+def _delete_stored(storage, stored):
+    for name in stored.values():
+        storage.delete(name)
+
+
+@transaction.atomic
+def finalize(job, stored):
+    # Saving the target fires the usual signals: primary image sync and cache invalidation.
+    if job.listing_image is not None:
+        image = job.listing_image
+        image.image, image.image_card, image.image_thumb = stored["full"], stored["card"], stored["thumb"]
+        image.upload_status = "ready"
+        image.save(update_fields=["image", "image_card", "image_thumb", "upload_status"])
+    elif job.seller is not None:
+        job.seller.profile_image = stored["full"]
+        job.seller.save(update_fields=["profile_image"])
+
+    # The image's upload_status now records the outcome; the staged file goes with the job (signals.py).
+    job.delete()
+
+
+@transaction.atomic
+def record_failure(job, exc):
+    job.attempts += 1
+    job.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+    job.locked_at = None
+    if job.attempts >= settings.IMAGE_UPLOAD_MAX_ATTEMPTS or isinstance(exc, UnprocessableImage):
+        job.status = "failed"
+        if job.listing_image is not None:
+            job.listing_image.upload_status = "failed"
+            job.listing_image.save(update_fields=["upload_status"])
+    else:
+        job.status = "pending"
+        delay = settings.IMAGE_UPLOAD_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.available_at = timezone.now() + timedelta(seconds=delay)
+    job.save(update_fields=["attempts", "last_error", "locked_at", "status", "available_at", "updated_at"])
+
+
+def prune_failed_jobs(now=None):
+    """Delete jobs that failed more than IMAGE_UPLOAD_FAILED_RETENTION days ago. Returns the number deleted."""
+    cutoff = (now or timezone.now()) - timedelta(days=settings.IMAGE_UPLOAD_FAILED_RETENTION)
+    deleted, _ = ImageUploadJob.objects.filter(status="failed", updated_at__lt=cutoff).delete()
+    return deleted
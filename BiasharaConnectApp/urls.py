@@ -5,7 +5,14 @@ from .views import (
     register_seller,
     login_user,
     list_active_listings,
+    listing_facets,
+    listing_detail,
+    seller_storefront,
+    my_listings,
     create_listing,
+    listing_upload_status,
+    bulk_import_listings,
+    bulk_update_listing_status,
     toggle_save_listing,
 )
 
@@ -23,7 +30,16 @@ urlpatterns = [
 
     # Listings
     path("listings/", list_active_listings, name="list_active_listings"),
+    path("listings/facets/", listing_facets, name="listing_facets"),
+    path("listings/<int:listing_id>/", listing_detail, name="listing_detail"),
     path("listings/create/", create_listing, name="create_listing"),
+    path("listings/<int:listing_id>/uploads/", listing_upload_status, name="listing_upload_status"),
+    path("listings/import/", bulk_import_listings, name="bulk_import_listings"),
+    path("listings/mine/", my_listings, name="my_listings"),
+    path("listings/bulk-status/", bulk_update_listing_status, name="bulk_update_listing_status"),
+
+    # Seller storefront
+    path("sellers/<int:seller_id>/listings/", seller_storefront, name="seller_storefront"),
 
     # Saved listings (buyer)
     path("listings/<int:listing_id>/toggle-save/", toggle_save_listing, name="toggle_save_listing"),
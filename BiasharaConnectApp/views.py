@@ -1,17 +1,50 @@
 from datetime import date
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from .serializers import (
     BuyerRegisterSerializer,
     SellerRegisterSerializer,
+    SellerHeaderSerializer,
     ListingSerializer,
     ListingCreateSerializer,
+    ListingBulkStatusSerializer,
+    ListingImageUploadSerializer,
 )
-from .models import Listing, SavedListing
+from .authentication import tokens_for_user
+from .models import SellerProfile, Listing, SavedListing
+from .cache import (
+    listings_page_key,
+    get_cached_page,
+    set_cached_page,
+    get_cached_listing,
+    set_cached_listing,
+    invalidate_listing_details,
+    get_cached_seller_header,
+    set_cached_seller_header,
+)
+from .conditional import listing_validators, representation_etag, not_modified, set_validators
+from .facets import facet_counts
+from .bulk import bulk_set_status
+from .imports import IMPORT_FORMATS, guess_format, read_rows, import_listings
+from .filters import (
+    ListingFilterSerializer,
+    ListingShapeSerializer,
+    SellerListingsFilterSerializer,
+    LISTING_VIEWS,
+    SORT_ORDERINGS,
+    filter_listings,
+)
+from .pagination import KeysetPagination
+from .throttling import LoginThrottle, RegisterThrottle, CreateListingThrottle
+from .rows import serialize_listing_rows
 
 
 # =========================
@@ -33,6 +66,7 @@ def api_home(request):
 # =========================
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterThrottle])
 def register_buyer(request):
     serializer = BuyerRegisterSerializer(data=request.data)
     if serializer.is_valid():
@@ -46,6 +80,7 @@ def register_buyer(request):
 # =========================
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterThrottle])
 def register_seller(request):
     serializer = SellerRegisterSerializer(data=request.data)
     if serializer.is_valid():
@@ -62,6 +97,7 @@ def register_seller(request):
 # =========================
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([LoginThrottle])
 def login_user(request):
     email = request.data.get("email")
     password = request.data.get("password")
@@ -73,7 +109,7 @@ def login_user(request):
     if not user:
         return Response({"error": "Invalid email or password"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    refresh = RefreshToken.for_user(user)
+    refresh = tokens_for_user(user)
     return Response({
         "access": str(refresh.access_token),
         "refresh": str(refresh),
@@ -87,15 +123,184 @@ def login_user(request):
     }, status=status.HTTP_200_OK)
 
 
+def paginate_listings(request, queryset, ordering, shape):
+    """
+    One keyset page of `queryset` as `{"next", "results"}`, in the
+    representation chosen by validated `view` / `fields` parameters.
+    """
+    fields = shape["fields"]
+    serializer_class = LISTING_VIEWS[shape["view"]]
+    ordering_columns = [name.lstrip("-") for name in ordering]
+    paginator = KeysetPagination(ordering=ordering)
+
+    if settings.LISTINGS_FAST_SERIALIZATION:
+        rows = paginator.paginate_queryset(queryset.values_for_fields(fields, extra=ordering_columns), request)
+        results = serialize_listing_rows(rows, fields, serializer_class)
+    else:
+        listings = paginator.paginate_queryset(queryset.with_fields(fields, extra=ordering_columns), request)
+        results = serializer_class(listings, many=True, fields=fields).data
+
+    return paginator.get_paginated_response(results).data
+
+
 # =========================
 # List Active Listings
 # =========================
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def list_active_listings(request):
-    listings = Listing.objects.filter(status="active")
-    serializer = ListingSerializer(listings, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    """
+    Cursor-paginated feed of active listings.
+    Search: q (full-text over title and description).
+    Filters: category, condition, location, area, min_price, max_price.
+    Sort: newest (default), price_asc, price_desc, popular, relevance (default with q).
+    The price sorts list unpriced listings after every priced one.
+    Shape: view=card for the compact grid representation, fields=a,b,c for a sparse fieldset.
+    Pass `?limit=` (max 100) and the returned `next` value as `?cursor=`.
+    Pages are cached until the next listing write (see cache.py) and carry
+    ETag / Last-Modified validators for conditional GETs.
+    """
+    cache_key = listings_page_key(request.query_params)
+    page = get_cached_page(cache_key)
+
+    if page is None:
+        filters = ListingFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset, ordering = filter_listings(Listing.objects.active(), filters.validated_data)
+        etag, last_modified = listing_validators(queryset, request.query_params)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        page = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": paginate_listings(request, queryset, ordering, filters.validated_data),
+        }
+        set_cached_page(cache_key, page)
+    else:
+        response = not_modified(request, page["etag"], page["last_modified"])
+        if response is not None:
+            return response
+
+    response = Response(page["data"], status=status.HTTP_200_OK)
+    return set_validators(response, page["etag"], page["last_modified"])
+
+
+# =========================
+# Listing Facets
+# =========================
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def listing_facets(request):
+    """
+    Counts per category, condition and location (and area, once a location is
+    chosen) for the feed's filters; each facet ignores its own filter.
+    Cached for LISTING_FACETS_CACHE_TIMEOUT or until the next listing write.
+    """
+    cache_key = listings_page_key(request.query_params, prefix="facets")
+    data = get_cached_page(cache_key)
+
+    if data is None:
+        filters = ListingFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = facet_counts(filters.validated_data)
+        set_cached_page(cache_key, data, timeout=settings.LISTING_FACETS_CACHE_TIMEOUT)
+
+    return Response(data, status=status.HTTP_200_OK)
+
+
+# =========================
+# Listing Detail
+# =========================
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def listing_detail(request, listing_id):
+    """
+    A single active listing with its seller and images.
+    Cached per listing until it, its images or its seller change.
+    """
+    entry = get_cached_listing(listing_id)
+    if entry is None:
+        listing = Listing.objects.active().with_related().filter(pk=listing_id).first()
+        if not listing:
+            return Response({"error": "Listing not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        data = ListingSerializer(listing).data
+        entry = {
+            "etag": representation_etag(data),
+            "last_modified": int(listing.updated_at.timestamp()),
+            "data": data,
+        }
+        set_cached_listing(listing_id, entry)
+
+    response = not_modified(request, entry["etag"], entry["last_modified"])
+    if response is not None:
+        return response
+
+    response = Response(entry["data"], status=status.HTTP_200_OK)
+    return set_validators(response, entry["etag"], entry["last_modified"])
+
+
+# =========================
+# Seller Storefront
+# =========================
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def seller_storefront(request, seller_id):
+    """
+    A seller's header and their active listings, newest first.
+    Takes view / fields like the main feed; paginate with `?limit=` and `?cursor=`.
+    """
+    seller = get_cached_seller_header(seller_id)
+    if seller is None:
+        profile = SellerProfile.objects.filter(pk=seller_id).first()
+        if not profile:
+            return Response({"error": "Seller not found"}, status=status.HTTP_404_NOT_FOUND)
+        seller = SellerHeaderSerializer(profile).data
+        set_cached_seller_header(seller_id, seller)
+
+    cache_key = listings_page_key(request.query_params, prefix=f"seller:{seller_id}")
+    page = get_cached_page(cache_key)
+    if page is None:
+        shape = ListingShapeSerializer(data=request.query_params)
+        if not shape.is_valid():
+            return Response(shape.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Listing.objects.active().filter(seller_id=seller_id)
+        page = paginate_listings(request, queryset, SORT_ORDERINGS["newest"], shape.validated_data)
+        set_cached_page(cache_key, page)
+
+    return Response({"seller": seller, **page}, status=status.HTTP_200_OK)
+
+
+# =========================
+# My Listings (Seller)
+# =========================
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def my_listings(request):
+    """
+    The authenticated seller's listings in every status, newest first.
+    Narrow with `?status=active|inactive|deleted`; takes view / fields / limit / cursor.
+    """
+    if request.user.role != "seller":
+        return Response({"error": "Only sellers can view their listings"}, status=status.HTTP_403_FORBIDDEN)
+
+    filters = SellerListingsFilterSerializer(data=request.query_params)
+    if not filters.is_valid():
+        return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = Listing.objects.filter(seller__user=request.user)
+    if filters.validated_data.get("status"):
+        queryset = queryset.filter(status=filters.validated_data["status"])
+
+    data = paginate_listings(request, queryset, SORT_ORDERINGS["newest"], filters.validated_data)
+    return Response(data, status=status.HTTP_200_OK)
 
 
 # =========================
@@ -103,6 +308,7 @@ def list_active_listings(request):
 # =========================
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@throttle_classes([CreateListingThrottle])
 def create_listing(request):
     """
     Allow sellers or admin users to create listings with multiple Cloudinary image URLs.
@@ -112,11 +318,113 @@ def create_listing(request):
 
     serializer = ListingCreateSerializer(data=request.data, context={"request": request})
     if serializer.is_valid():
-        serializer.save()
-        return Response({"message": "Listing created successfully"}, status=status.HTTP_201_CREATED)
+        listing = serializer.save()
+        return Response({"message": "Listing created successfully", "id": listing.id}, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# =========================
+# Listing Image Upload Status
+# =========================
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def listing_upload_status(request, listing_id):
+    """
+    Upload progress of a listing's images, for its seller (or an admin) to poll
+    after create_listing: each image is pending, ready or failed.
+    """
+    listings = Listing.objects.all()
+    if request.user.role != "admin":
+        listings = listings.filter(seller__user=request.user)
+    listing = listings.filter(pk=listing_id).first()
+    if not listing:
+        return Response({"error": "Listing not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    images = listing.images.select_related("upload_job").order_by("id")
+    data = ListingImageUploadSerializer(images, many=True).data
+    return Response({
+        "listing": listing.id,
+        "pending": sum(1 for image in data if image["upload_status"] == "pending"),
+        "images": data,
+    }, status=status.HTTP_200_OK)
+
+
+# =========================
+# Bulk Import Listings (Seller)
+# =========================
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_import_listings(request):
+    """
+    Create listings from an uploaded CSV or JSON Lines `file` (one listing per
+    row, with the create_listing fields except images). The format comes from
+    the file extension unless `format=csv|jsonl` is given. Valid rows are
+    imported even when others fail; the response reports each failed row.
+    """
+    if request.user.role != "seller":
+        return Response({"error": "Only sellers can import listings"}, status=status.HTTP_403_FORBIDDEN)
+
+    upload = request.FILES.get("file")
+    if not upload:
+        return Response({"error": "Upload a CSV or JSON Lines file as `file`"}, status=status.HTTP_400_BAD_REQUEST)
+
+    fmt = request.data.get("format") or guess_format(upload.name)
+    if fmt not in IMPORT_FORMATS:
+        return Response({"error": "Format must be csv or jsonl"}, status=status.HTTP_400_BAD_REQUEST)
+
+    seller = SellerProfile.objects.filter(user=request.user).first()
+    if not seller:
+        return Response({"error": "User does not have a seller profile"}, status=status.HTTP_400_BAD_REQUEST)
+
+    result = import_listings(
+        seller,
+        read_rows(upload, fmt),
+        chunk_size=settings.LISTING_IMPORT_CHUNK_SIZE,
+        max_rows=settings.LISTING_IMPORT_MAX_ROWS,
+    )
+    return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+
+# =========================
+# Bulk Status Change (Seller or Admin)
+# =========================
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_update_listing_status(request):
+    """
+    Move many listings to one `status`, chosen by `ids` (up to 1000) or by a
+    `filter` of status / category / condition / location / area.
+    Sellers can only change their own listings; admins can change any.
+    """
+    if request.user.role not in ["seller", "admin"]:
+        return Response({"error": "Only sellers or admin users can update listings"}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = ListingBulkStatusSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+
+    queryset = Listing.objects.all()
+    if request.user.role != "admin":
+        queryset = queryset.filter(seller__user=request.user)
+
+    if "ids" in data:
+        queryset = queryset.filter(id__in=data["ids"])
+        found = set(queryset.values_list("id", flat=True))
+        matched, not_found = len(found), sorted(set(data["ids"]) - found)
+    else:
+        queryset = queryset.filter(**data["filter"])
+        matched = queryset.count()
+        not_found = []
+
+    updated = bulk_set_status(queryset, data["status"])
+    return Response({
+        "matched": matched,
+        "updated": updated,
+        "not_found": not_found,
+    }, status=status.HTTP_200_OK)
+
+
 # =========================
 # Save / Unsave Listing
 # =========================
@@ -126,13 +434,28 @@ def toggle_save_listing(request, listing_id):
     if request.user.role != "buyer":
         return Response({"error": "Only buyers can save listings"}, status=status.HTTP_403_FORBIDDEN)
 
-    listing = Listing.objects.filter(id=listing_id, status="active").first()
+    listing = Listing.objects.active().filter(id=listing_id).first()
     if not listing:
         return Response({"error": "Listing not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    saved, created = SavedListing.objects.get_or_create(buyer=request.user.buyer_profile, listing=listing)
+    with transaction.atomic():
+        saved, created = SavedListing.objects.get_or_create(buyer_id=request.user.buyer_profile_id, listing=listing)
+        # updated_at moves with the count, so the listing's ETag / Last-Modified do too.
+        if created:
+            Listing.objects.filter(pk=listing.pk).update(save_count=F("save_count") + 1, updated_at=timezone.now())
+        else:
+            # A concurrent unsave may have deleted the row since get_or_create
+            # found it; only the request that removed it moves the count.
+            deleted, _ = saved.delete()
+            if deleted:
+                Listing.objects.filter(pk=listing.pk).update(
+                    save_count=Greatest(F("save_count") - 1, 0), updated_at=timezone.now()
+                )
+        # The feed picks the new count up within LISTINGS_CACHE_TIMEOUT; a
+        # version bump per save would churn the whole feed cache.
+        if created or deleted:
+            transaction.on_commit(lambda: invalidate_listing_details([listing.pk]))
+
     if not created:
-        saved.delete()
         return Response({"message": "Listing unsaved"}, status=status.HTTP_200_OK)
-
     return Response({"message": "Listing saved"}, status=status.HTTP_200_OK)